@@ -0,0 +1,29 @@
+from django.urls import path
+
+from . import views
+
+app_name = "api"
+
+urlpatterns = [
+    path("posts/", views.PostListView.as_view(), name="posts"),
+    path(
+        "categories/<slug:category_slug>/posts/",
+        views.CategoryPostListView.as_view(),
+        name="category_posts",
+    ),
+    path(
+        "posts/<int:post_id>/",
+        views.PostDetailView.as_view(),
+        name="post_detail",
+    ),
+    path(
+        "posts/<int:post_id>/comments/",
+        views.CommentListView.as_view(),
+        name="post_comments",
+    ),
+    path(
+        "profiles/<slug:username>/posts/",
+        views.ProfilePostListView.as_view(),
+        name="profile_posts",
+    ),
+]
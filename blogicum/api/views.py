@@ -0,0 +1,216 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import BadRequest
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Case, F, When
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from blog.lookups import get_published_category
+from blog.mixins import ConditionalGetMixin, latest_change
+from blog.models import Category, Comment, Location, Post
+from blog.paginators import CursorPaginator
+from blogicum.settings import COMMENTS_IN_PAGE, POST_IN_PAGE
+
+User = get_user_model()
+
+POST_FIELDS = {
+    "id": F("id"),
+    "title": F("title"),
+    "excerpt": F("excerpt"),
+    "text": F("text"),
+    "pub_date": F("pub_date"),
+    "updated_at": F("updated_at"),
+    "author": F("author__username"),
+    "category": F("category__slug"),
+    "location": Case(
+        When(location__is_published=True, then=F("location__name"))
+    ),
+    "image": F("image"),
+    "comment_count": F("comment_count"),
+}
+POST_LIST_FIELDS = tuple(name for name in POST_FIELDS if name != "text")
+
+COMMENT_FIELDS = {
+    "id": F("id"),
+    "text": F("text"),
+    "author": F("author__username"),
+    "created_at": F("created_at"),
+    "updated_at": F("updated_at"),
+}
+
+
+class JsonView(View):
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(
+            self.get_data(),
+            encoder=DjangoJSONEncoder,
+            json_dumps_params={"ensure_ascii": False},
+        )
+
+
+class ApiView(ConditionalGetMixin, JsonView):
+    """Отдаёт строки из values(), не создавая экземпляры моделей.
+
+    Параметр fields= ограничивает и ответ, и выбираемые из базы колонки.
+    """
+
+    fields = POST_FIELDS
+    default_fields = POST_LIST_FIELDS
+    fields_kwarg = "fields"
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404 as error:
+            return JsonResponse({"detail": str(error)}, status=404)
+        except (BadRequest, InvalidPage) as error:
+            return JsonResponse({"detail": str(error)}, status=400)
+
+    def get_field_names(self):
+        requested = self.request.GET.get(self.fields_kwarg)
+        if not requested:
+            return list(self.default_fields)
+        names = list(dict.fromkeys(
+            name.strip() for name in requested.split(",") if name.strip()
+        ))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise BadRequest(f"Неизвестные поля: {', '.join(unknown)}")
+        return names
+
+    def select(self, queryset, names, *columns):
+        return queryset.values(
+            *columns,
+            **{f"api_{name}": self.fields[name] for name in names},
+        )
+
+    def serialize(self, row, names):
+        data = {name: row[f"api_{name}"] for name in names}
+        if data.get("image"):
+            data["image"] = Post.image.field.storage.url(data["image"])
+        elif "image" in data:
+            data["image"] = None
+        return data
+
+    def get_last_modified(self):
+        return latest_change(
+            (Post.objects.all(), "updated_at"),
+            (Comment.objects.all(), "updated_at"),
+            (Category.objects.all(), "updated_at"),
+            (Location.objects.all(), "updated_at"),
+        )
+
+
+class ListApiView(ApiView):
+    paginate_by = POST_IN_PAGE
+    key_field = "pub_date"
+    descending = True
+    cursor_kwarg = "cursor"
+    queryset = None
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def page_url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query[self.cursor_kwarg] = cursor
+        return f"{self.request.path}?{query.urlencode()}"
+
+    def get_data(self):
+        names = self.get_field_names()
+        paginator = CursorPaginator(
+            self.select(self.get_queryset(), names, "id", self.key_field),
+            self.paginate_by,
+            key_field=self.key_field,
+            descending=self.descending,
+        )
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return {
+            "results": [self.serialize(row, names) for row in page],
+            "next": self.page_url(page.next_cursor),
+            "previous": self.page_url(page.previous_cursor),
+        }
+
+
+class PostListView(ListApiView):
+    queryset = Post.objects.published()
+
+
+class CategoryPostListView(ListApiView):
+    def get_queryset(self):
+        category = get_published_category(self.kwargs["category_slug"])
+        if category is None:
+            raise Http404("Категория не найдена")
+        return Post.objects.published().filter(category_id=category.pk)
+
+
+class ProfilePostListView(ListApiView):
+    def get_profile(self):
+        if not hasattr(self, "profile"):
+            self.profile = get_object_or_404(
+                User, username=self.kwargs["username"]
+            )
+        return self.profile
+
+    def get_queryset(self):
+        return Post.objects.visible_to(self.request.user).filter(
+            author=self.get_profile()
+        )
+
+    def get_last_modified(self):
+        posts = Post.objects.filter(author=self.get_profile())
+        return latest_change(
+            (posts, "updated_at"),
+            (Comment.objects.filter(post__in=posts), "updated_at"),
+        )
+
+
+class PostDetailView(ApiView):
+    default_fields = tuple(POST_FIELDS)
+
+    def get_post_queryset(self):
+        return Post.objects.visible_to(self.request.user).filter(
+            pk=self.kwargs["post_id"]
+        )
+
+    def get_data(self):
+        names = self.get_field_names()
+        row = self.select(self.get_post_queryset(), names).first()
+        if row is None:
+            raise Http404("Публикация не найдена")
+        return self.serialize(row, names)
+
+    def get_last_modified(self):
+        return latest_change(
+            (self.get_post_queryset(), "updated_at"),
+            (
+                Comment.objects.filter(post_id=self.kwargs["post_id"]),
+                "updated_at",
+            ),
+        )
+
+
+class CommentListView(ListApiView):
+    fields = COMMENT_FIELDS
+    default_fields = tuple(COMMENT_FIELDS)
+    paginate_by = COMMENTS_IN_PAGE
+    key_field = "created_at"
+    descending = False
+
+    def get_queryset(self):
+        posts = Post.objects.visible_to(self.request.user)
+        if not posts.filter(pk=self.kwargs["post_id"]).exists():
+            raise Http404("Публикация не найдена")
+        return Comment.objects.filter(post_id=self.kwargs["post_id"])
+
+    def get_last_modified(self):
+        return latest_change(
+            (
+                Comment.objects.filter(post_id=self.kwargs["post_id"]),
+                "updated_at",
+            ),
+        )
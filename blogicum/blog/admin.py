@@ -1,6 +1,37 @@
 from django.contrib import admin  # type: ignore
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q
 
 from .models import Category, Location, Post, Comment
+from .paginators import EstimatedCountPaginator
+from .search import COMMENT_INDEX, POST_INDEX, matching_ids, search_terms
+
+User = get_user_model()
+
+
+class RowAutocompleteSelect(AutocompleteSelect):
+    """Автодополнение, которое берёт выбранный объект из строки списка.
+
+    Стандартный виджет загружает выбранный объект отдельным запросом
+    для каждой строки, хотя list_select_related его уже загрузил.
+    """
+
+    selected = None
+
+    def optgroups(self, name, value, attr=None):
+        obj = self.selected
+        if obj is None or [str(obj.pk)] != [str(item) for item in value]:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, "", "", False, 0))
+        label = self.choices.field.label_from_instance(obj)
+        options.append(
+            self.create_option(name, obj.pk, label, True, len(options))
+        )
+        return [(None, options, 0)]
 
 
 class LocationAdmin(admin.ModelAdmin):
@@ -28,22 +59,64 @@ class PostAdmin(admin.ModelAdmin):
         "is_published",
         "created_at",
     )
+    # autocomplete_fields действует и на формы списка: категория
+    # и местоположение редактируются полями автодополнения, а не
+    # <select> со всеми строками таблицы.
     list_editable = (
         "is_published",
         "location",
         "category",
     )
+    list_select_related = ("author", "category", "location")
+    autocomplete_fields = ("author", "category", "location")
     search_fields = (
         "title",
         "text",
     )
+    # Запросы боковой панели (см. bench_admin -v 2): фильтр категорий —
+    # один SELECT по небольшой таблице blog_category, is_published
+    # запросов не делает. date_hierarchy выполняет MIN/MAX по индексу
+    # и SELECT DISTINCT по отфильтрованным строкам — самый дорогой
+    # запрос страницы на больших таблицах.
     list_filter = (
-        "category",
         "is_published",
-        "location",
-        "author",
+        "category",
     )
+    date_hierarchy = "pub_date"
     list_display_links = ("title",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.list_editable:
+            kwargs["widget"] = RowAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get("using")
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_form(self, request, **kwargs):
+        base = super().get_changelist_form(request, **kwargs)
+        editable = [
+            name for name in self.list_editable
+            if Post._meta.get_field(name).is_relation
+        ]
+
+        class ChangeListForm(base):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                for name in editable:
+                    widget = self.fields[name].widget
+                    widget = getattr(widget, "widget", widget)
+                    widget.selected = getattr(self.instance, name)
+
+        return ChangeListForm
+
+    def get_search_results(self, request, queryset, search_term):
+        terms = search_terms(search_term)
+        ids = matching_ids(POST_INDEX, terms) if terms else None
+        if ids is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(id__in=ids), False
 
 
 class CategoryAdmin(admin.ModelAdmin):
@@ -71,9 +144,62 @@ class CategoryAdmin(admin.ModelAdmin):
 class CommentAdmin(admin.ModelAdmin):
     list_display = ("post", "text", "created_at", "author")
     list_editable = ("text",)
-    search_fields = ("text", "post", "author")
-    list_filter = ("post", "text", "created_at", "author")
+    list_select_related = ("post", "author")
+    autocomplete_fields = ("post", "author")
+    search_fields = ("text", "author__username", "post__title")
+    # is_published запросов не делает; date_hierarchy, как и у публикаций,
+    # выполняет MIN/MAX и SELECT DISTINCT по отфильтрованным строкам.
+    list_filter = ("is_published",)
+    date_hierarchy = "created_at"
     list_display_links = ("author", "post")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет по индексам: текст комментария и заголовок публикации —
+        через полнотекстовый индекс, автора — по префиксу имени.
+        """
+        terms = search_terms(search_term)
+        text_ids = matching_ids(COMMENT_INDEX, terms) if terms else None
+        if text_ids is None:
+            return super().get_search_results(request, queryset, search_term)
+        username = search_term.strip().lstrip("@")
+        # Диапазон вместо LIKE, чтобы использовался индекс по username.
+        authors = User.objects.filter(
+            username__gte=username, username__lt=username + "\uffff"
+        ).values("pk")
+        return queryset.filter(
+            Q(id__in=text_ids)
+            | Q(author__in=authors)
+            | Q(post__in=matching_ids(POST_INDEX, terms, column="title"))
+        ), False
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if not change:
+                Post.objects.filter(pk=obj.post_id).change_comment_count(1)
+            elif "post" in form.changed_data:
+                Post.objects.filter(
+                    pk=form.initial["post"]
+                ).change_comment_count(-1)
+                Post.objects.filter(pk=obj.post_id).change_comment_count(1)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            Post.objects.filter(pk=obj.post_id).change_comment_count(-1)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            removed = list(
+                queryset.order_by()
+                .values_list("post")
+                .annotate(count=Count("pk"))
+            )
+            super().delete_queryset(request, queryset)
+            for post_id, count in removed:
+                Post.objects.filter(pk=post_id).change_comment_count(-count)
 
 
 admin.site.empty_value_display = "-- Не задано --"
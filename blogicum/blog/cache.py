@@ -0,0 +1,105 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+FEED_VERSION_KEY = "blog:feed-version"
+MISSING = object()
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Начальное значение зависит от времени, чтобы после вытеснения
+        # ключа версии не ожили страницы, сохранённые под старой версией.
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        return get_version(key)
+
+
+def feed_version():
+    return get_version(FEED_VERSION_KEY)
+
+
+def bump_feed_version():
+    return bump_version(FEED_VERSION_KEY)
+
+
+def feed_page_key(path, version=None):
+    digest = hashlib.md5(path.encode()).hexdigest()
+    if version is None:
+        version = feed_version()
+    return f"blog:feed-page:{version}:{digest}"
+
+
+def feed_cache_timeout():
+    """Время жизни страницы ленты: не дольше, чем до ближайшей публикации."""
+    from .models import Post
+
+    timeout = settings.FEED_CACHE_TIMEOUT
+    now = timezone.now()
+    next_pub_date = (
+        Post.objects.filter(
+            is_published=True, is_visible=False, pub_date__gte=now
+        )
+        .order_by("pub_date")
+        .values_list("pub_date", flat=True)
+        .first()
+    )
+    if next_pub_date is not None:
+        timeout = min(
+            timeout, math.ceil((next_pub_date - now).total_seconds())
+        )
+    return max(timeout, 0)
+
+
+def get_last_modified(etag, compute):
+    """Время последнего изменения страницы, закэшированное по её ETag.
+
+    ETag меняется вместе с данными страницы, поэтому значение
+    не устаревает и не требует отдельной инвалидации.
+    """
+    key = f"blog:last-modified:{etag}"
+    last_modified = cache.get(key, MISSING)
+    if last_modified is MISSING:
+        last_modified = compute()
+        cache.set(key, last_modified, settings.FEED_CACHE_TIMEOUT)
+    return last_modified
+
+
+def profile_card_key(user_id):
+    return f"blog:profile-card:{user_id}"
+
+
+def get_profile_card(user):
+    from .models import Comment, Post
+
+    key = profile_card_key(user.pk)
+    card = cache.get(key)
+    if card is None:
+        card = {
+            "username": user.username,
+            "full_name": user.get_full_name(),
+            "date_joined": user.date_joined,
+            "post_count": Post.objects.published().filter(
+                author=user
+            ).count(),
+            "comment_count": Comment.objects.filter(author=user).count(),
+        }
+        cache.set(key, card, settings.PROFILE_CARD_TIMEOUT)
+    return card
+
+
+def invalidate_profile_card(user_id):
+    cache.delete(profile_card_key(user_id))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+}
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Кэш должен быть общим для веб-процессов и фоновых команд.
+
+    Версии лент и справочников меняют run_jobs, publish_scheduled
+    и команды импорта; с кэшем в памяти процесса веб-процессы этого
+    не увидят и будут отдавать устаревшие страницы.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Error(
+            f"Кэш по умолчанию {backend} не общий для процессов.",
+            hint=(
+                "Используйте DatabaseCache, Memcached или Redis, "
+                "чтобы сброс версий из фоновых команд доходил "
+                "до веб-процессов."
+            ),
+            id="blog.E001",
+        )
+    ]
@@ -0,0 +1,94 @@
+from django.conf import settings
+
+from .models import FeedEntry, Post
+from .querysets import published_q
+
+
+def build_entry(post):
+    location = post.location
+    return FeedEntry(
+        post=post,
+        category_id=post.category_id,
+        author_id=post.author_id,
+        location_id=post.location_id,
+        pub_date=post.pub_date,
+        title=post.title,
+        excerpt=post.excerpt,
+        author_username=post.author.username,
+        category_slug=post.category.slug,
+        category_title=post.category.title,
+        location_name=(
+            location.name if location and location.is_published else ""
+        ),
+        image_url=post.image.url if post.image else "",
+        thumbnail_url=post.thumbnail_url or "",
+        thumbnail_webp_url=post.thumbnail_webp_url or "",
+        comment_count=post.comment_count,
+    )
+
+
+def _visible_posts():
+    return (
+        Post.objects.filter(published_q())
+        .post_select_related()
+        .defer("text")
+    )
+
+
+def sync_posts(pks):
+    """Приводит записи ленты указанных публикаций в соответствие с ними."""
+    if not settings.FEED_TABLE:
+        return
+    pks = list(pks)
+    entries = [build_entry(post) for post in _visible_posts().filter(
+        pk__in=pks
+    )]
+    FeedEntry.objects.filter(pk__in=pks).delete()
+    FeedEntry.objects.bulk_create(entries)
+
+
+def sync_category(category):
+    if not settings.FEED_TABLE:
+        return
+    FeedEntry.objects.filter(category=category).delete()
+    rebuild(_visible_posts().filter(category=category))
+
+
+def sync_location(location):
+    if not settings.FEED_TABLE:
+        return
+    FeedEntry.objects.filter(location=location).update(
+        location_name=location.name if location.is_published else ""
+    )
+
+
+def sync_author(user):
+    if not settings.FEED_TABLE:
+        return
+    FeedEntry.objects.filter(author=user).update(
+        author_username=user.username
+    )
+
+
+def sync_image(image_name):
+    if not settings.FEED_TABLE:
+        return
+    sync_posts(
+        Post.objects.filter(image=image_name).values_list("pk", flat=True)
+    )
+
+
+def rebuild(posts=None, batch_size=1000):
+    """Создаёт записи ленты пачками; возвращает число записей."""
+    if posts is None:
+        FeedEntry.objects.all().delete()
+        posts = _visible_posts()
+    created = 0
+    batch = []
+    for post in posts.order_by("pk").iterator(chunk_size=batch_size):
+        batch.append(build_entry(post))
+        if len(batch) >= batch_size:
+            created += len(FeedEntry.objects.bulk_create(batch))
+            batch = []
+    created += len(FeedEntry.objects.bulk_create(batch))
+    return created
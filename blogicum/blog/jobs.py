@@ -0,0 +1,21 @@
+from jobs.queue import register
+
+from . import feed
+from .cache import bump_feed_version
+from .scheduling import publish_due_posts
+from .thumbnails import generate_derivatives, mark_derivatives
+
+
+@register(name="blog.generate_thumbnails")
+def generate_thumbnails(image_name):
+    generate_derivatives(image_name)
+    if mark_derivatives(image_name):
+        feed.sync_image(image_name)
+        bump_feed_version()
+
+
+@register(name="blog.publish_scheduled")
+def publish_scheduled(post_id=None, pub_date=None):
+    # Аргументы только отличают задачи разных публикаций в очереди;
+    # публикуются все публикации, время которых наступило.
+    publish_due_posts()
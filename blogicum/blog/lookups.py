@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .cache import bump_version, get_version
+
+LOOKUPS_VERSION_KEY = "blog:lookups-version"
+
+
+class LookupCache:
+    """Ограниченный по размеру LRU-кэш объектов в памяти процесса.
+
+    Содержимое сбрасывается, когда меняется версия в общем кэше.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def sync(self):
+        version = get_version(LOOKUPS_VERSION_KEY)
+        with self._lock:
+            if version != self._version:
+                self._items.clear()
+                self._version = version
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return None
+            return self._items[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+
+lookup_cache = LookupCache(settings.LOOKUP_CACHE_SIZE)
+
+
+def invalidate_lookups():
+    bump_version(LOOKUPS_VERSION_KEY)
+
+
+def _get_many(model, pks):
+    found = {}
+    missing = []
+    for pk in pks:
+        obj = lookup_cache.get((model.__name__, pk))
+        if obj is None:
+            missing.append(pk)
+        else:
+            found[pk] = obj
+    if missing:
+        for pk, obj in model.objects.in_bulk(missing).items():
+            lookup_cache.set((model.__name__, pk), obj)
+            found[pk] = obj
+    return found
+
+
+def get_published_category(slug):
+    from .models import Category
+
+    lookup_cache.sync()
+    category = lookup_cache.get(("category-slug", slug))
+    if category is None:
+        category = Category.objects.filter(
+            slug=slug, is_published=True
+        ).first()
+        if category is None:
+            return None
+        lookup_cache.set(("category-slug", slug), category)
+        lookup_cache.set((Category.__name__, category.pk), category)
+    return category
+
+
+def attach_lookups(posts):
+    """Подставляет категории и местоположения публикаций из памяти."""
+    from .models import Category, Location, Post
+
+    posts = list(posts)
+    lookup_cache.sync()
+    categories = _get_many(
+        Category, {post.category_id for post in posts if post.category_id}
+    )
+    locations = _get_many(
+        Location, {post.location_id for post in posts if post.location_id}
+    )
+    category_field = Post._meta.get_field("category")
+    location_field = Post._meta.get_field("location")
+    for post in posts:
+        category_field.set_cached_value(
+            post, categories.get(post.category_id)
+        )
+        location_field.set_cached_value(
+            post, locations.get(post.location_id)
+        )
+    return posts
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog import feed
+from blog.models import Post, make_excerpt
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет сохранённые отрывки публикаций по их текущему тексту "
+        "и исправляет устаревшие."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько публикаций обновлять за одну транзакцию.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        posts = Post.objects.only("pk", "text", "excerpt").order_by("pk")
+        checked = fixed = 0
+        last_pk = 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            changed = []
+            for post in batch:
+                excerpt = make_excerpt(post.text)
+                if post.excerpt != excerpt:
+                    post.excerpt = excerpt
+                    changed.append(post)
+            with transaction.atomic():
+                Post.objects.bulk_update(changed, ["excerpt"])
+                feed.sync_posts(post.pk for post in changed)
+            checked += len(batch)
+            fixed += len(changed)
+            last_pk = batch[-1].pk
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Проверено публикаций: {checked}, обновлено отрывков: {fixed}"
+            )
+        )
@@ -0,0 +1,147 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+from core.profiling import profile
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет время загрузки списков публикаций и комментариев "
+        "в админке. Все изменения выполняются в транзакции и откатываются. "
+        "С --verbosity 2 выводит запросы каждой страницы."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=50000,
+            help="Сколько синтетических публикаций добавить перед замером.",
+        )
+        parser.add_argument(
+            "--comments",
+            type=int,
+            default=100000,
+            help="Сколько синтетических комментариев добавить перед замером.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Сколько раз загрузить каждую страницу.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+        )
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stdout.write(
+                self.style.WARNING(
+                    "DEBUG включён: шаблоны не кэшируются, "
+                    "время отрисовки завышено."
+                )
+            )
+        with transaction.atomic():
+            user = User.objects.create_superuser(
+                username="bench_admin", password=None
+            )
+            if options["posts"] or options["comments"]:
+                self.populate(
+                    user,
+                    options["posts"],
+                    options["comments"],
+                    options["batch_size"],
+                )
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            year = timezone.now().year
+            pages = {
+                "Публикации": (Post, {}),
+                "Публикации за год": (Post, {"pub_date__year": year}),
+                "Комментарии": (Comment, {}),
+                "Комментарии за год": (Comment, {"created_at__year": year}),
+            }
+            for name, (model, params) in pages.items():
+                self.report(
+                    name, model, params, user, options["runs"],
+                    options["verbosity"],
+                )
+            transaction.set_rollback(True)
+
+    def populate(self, author, posts, comments, batch_size):
+        category = Category.objects.create(
+            title="Бенчмарк", description="-", slug="bench-admin"
+        )
+        location = Location.objects.create(name="Бенчмарк")
+        now = timezone.now()
+        for start in range(0, posts, batch_size):
+            Post.objects.bulk_create(
+                Post(
+                    author=author,
+                    category=category,
+                    location=location,
+                    title=f"Публикация {number}",
+                    text="-",
+                    excerpt="-",
+                    pub_date=now - timedelta(minutes=number),
+                    is_visible=True,
+                )
+                for number in range(start, min(start + batch_size, posts))
+            )
+        post_ids = list(Post.objects.values_list("pk", flat=True)[:1000])
+        if comments and not post_ids:
+            post_ids = [
+                Post.objects.create(
+                    author=author, category=category, title="-",
+                    text="-", pub_date=now,
+                ).pk
+            ]
+        for start in range(0, comments, batch_size):
+            Comment.objects.bulk_create(
+                Comment(
+                    post_id=post_ids[number % len(post_ids)],
+                    author=author,
+                    text=f"Комментарий {number}",
+                )
+                for number in range(start, min(start + batch_size, comments))
+            )
+        self.stdout.write(
+            f"Добавлено публикаций: {posts}, комментариев: {comments}"
+        )
+
+    def report(self, name, model, params, user, runs, verbosity):
+        model_admin = admin.site._registry[model]
+        opts = model._meta
+        request_factory = RequestFactory()
+        timings = []
+        for _ in range(runs):
+            request = request_factory.get(
+                f"/admin/{opts.app_label}/{opts.model_name}/", params
+            )
+            request.user = user
+            with profile() as result:
+                started = time.perf_counter()
+                model_admin.changelist_view(request).render()
+                timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"{name}: медиана {statistics.median(timings):.2f} мс, "
+            f"запросов: {result.sql_count}"
+        )
+        if verbosity > 1:
+            for query in result.queries:
+                self.stdout.write(f"  [{query.duration:.2f} мс] {query.sql}")
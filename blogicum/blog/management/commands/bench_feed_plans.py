@@ -0,0 +1,138 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from blog.models import Category, Location, Post
+
+User = get_user_model()
+
+FEED_INDEXES = (
+    "post_visible_pub_date_idx",
+    "post_category_feed_idx",
+    "post_author_pub_date_idx",
+    "post_visible_feed_idx",
+    # Индекс админки тоже отдаёт строки в порядке pub_date; без него
+    # проход «без индексов» показывает настоящее полное сканирование.
+    "post_pub_date_idx",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Показывает планы и время запросов ленты без составных индексов "
+        "и с ними. Все изменения выполняются в транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=1000000,
+            help=(
+                "Сколько синтетических публикаций добавить перед замером; "
+                "0 — мерить на текущих данных."
+            ),
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Сколько раз выполнить каждый запрос.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            category = author = None
+            if options["posts"]:
+                category, author = self.populate(
+                    options["posts"], options["batch_size"]
+                )
+            self.analyze()
+            queries = self.feed_queries(category, author)
+
+            self.stdout.write(self.style.MIGRATE_HEADING("С индексами"))
+            self.report(queries, options["runs"])
+
+            with connection.cursor() as cursor:
+                for name in FEED_INDEXES:
+                    cursor.execute(
+                        f"DROP INDEX {connection.ops.quote_name(name)}"
+                    )
+            self.analyze()
+            self.stdout.write(self.style.MIGRATE_HEADING("Без индексов"))
+            self.report(queries, options["runs"])
+
+            transaction.set_rollback(True)
+
+    def populate(self, total, batch_size):
+        author = User.objects.create(username="bench_feed_plans")
+        categories = [
+            Category.objects.create(
+                title=f"Категория {number}",
+                description="-",
+                slug=f"bench-feed-{number}",
+                is_published=number % 10 != 0,
+            )
+            for number in range(50)
+        ]
+        location = Location.objects.create(name="Бенчмарк")
+        now = timezone.now()
+        for start in range(0, total, batch_size):
+            Post.objects.bulk_create(
+                (
+                    Post(
+                        author=author,
+                        category=categories[number % len(categories)],
+                        location=location,
+                        title=f"Публикация {number}",
+                        text="-",
+                        pub_date=now - timedelta(minutes=number),
+                        is_published=number % 20 != 0,
+                        is_visible=number % 20 != 0,
+                    )
+                    for number in range(
+                        start, min(start + batch_size, total)
+                    )
+                ),
+                batch_size=batch_size,
+            )
+        self.stdout.write(f"Добавлено публикаций: {total}")
+        # Замеряются самые большие ленты: в каждой категории
+        # total / 50 публикаций, у автора — все.
+        return categories[1], author
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def feed_queries(self, category=None, author=None):
+        if category is None:
+            category = Category.objects.filter(is_published=True).first()
+            author = Post.objects.values_list("author", flat=True).first()
+        return {
+            "Главная": Post.objects.published(),
+            "Категория": Post.objects.published().filter(category=category),
+            "Профиль": Post.objects.filter(author=author),
+        }
+
+    def report(self, queries, runs):
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                list(queryset[:10])
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"{name}: медиана {statistics.median(timings):.2f} мс"
+            )
+            self.stdout.write(queryset[:10].explain())
@@ -0,0 +1,59 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.template.loader import get_template
+
+from blog.paginators import WindowedPaginator
+
+# Прежняя разметка: ссылка на каждую страницу.
+FULL_PAGE_RANGE = Template(
+    "{% for i in page_obj.paginator.page_range %}"
+    '<li class="page-item"><a class="page-link" href="?page={{ i }}">'
+    "{{ i }}</a></li>"
+    "{% endfor %}"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время отрисовки пагинатора со ссылками на все страницы "
+        "и с окном вокруг текущей страницы."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000, 10000, 100000],
+            help="Числа страниц, для которых выполнить замер.",
+        )
+        parser.add_argument("--runs", type=int, default=20)
+
+    def handle(self, *args, **options):
+        windowed = get_template("includes/paginator.html")
+        for pages in options["pages"]:
+            paginator = WindowedPaginator(range(pages * 10), 10)
+            page_obj = paginator.page(pages // 2 or 1)
+            context = {"page_obj": page_obj}
+            full_ms = self.measure(
+                lambda: FULL_PAGE_RANGE.render(Context(context)),
+                options["runs"],
+            )
+            windowed_ms = self.measure(
+                lambda: windowed.render(context), options["runs"]
+            )
+            self.stdout.write(
+                f"Страниц: {pages:>7} | все ссылки: {full_ms:9.3f} мс"
+                f" | окно: {windowed_ms:7.3f} мс"
+            )
+
+    def measure(self, render, runs):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,207 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from blog import urls as blog_urls
+from blog.models import Category, Comment, Location, Post
+from core.profiling import profile
+
+
+def percentile(values, percent):
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[
+        percent - 1
+    ]
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+class Command(BaseCommand):
+    help = (
+        "Запрашивает каждый адрес blog/urls.py тестовым клиентом от имени "
+        "гостя и автора и записывает в JSON медиану и 99-й перцентиль "
+        "времени ответа, число и время SQL-запросов, время отрисовки "
+        "шаблонов и размер ответа."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=20,
+            help="Сколько раз запросить каждый адрес.",
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Очищать кэш перед каждым запросом.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Файл результатов; по умолчанию bench-urls-<время>.json.",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Файл прошлого прогона, с которым сравнить результаты.",
+        )
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stdout.write(
+                self.style.WARNING(
+                    "DEBUG включён: шаблоны не кэшируются, "
+                    "время отрисовки завышено."
+                )
+            )
+        post = (
+            Post.objects.published()
+            .select_related("category", "author")
+            .order_by("-comment_count", "-pk")
+            .first()
+        )
+        if post is None:
+            raise CommandError(
+                "Нет опубликованных публикаций; заполните базу командой "
+                "seed_blog."
+            )
+        # Комментарий автора публикации, чтобы страницы его правки
+        # и удаления открывались, а не перенаправляли.
+        comments = Comment.objects.filter(post=post).order_by("pk")
+        comment = (
+            comments.filter(author=post.author).first() or comments.first()
+        )
+        values = {
+            "post_id": post.pk,
+            "category_slug": post.category.slug,
+            "username": post.author.username,
+            "comment_id": comment.pk if comment else 0,
+            "feed_format": "rss",
+        }
+        query = {"search": {"q": post.title.split()[0]}}
+        # Адрес не из INTERNAL_IPS, чтобы не встраивалась панель отладки.
+        clients = {
+            "гость": Client(HTTP_HOST="localhost", REMOTE_ADDR="192.0.2.1"),
+            "автор": Client(HTTP_HOST="localhost", REMOTE_ADDR="192.0.2.1"),
+        }
+        clients["автор"].force_login(post.author)
+
+        results = {}
+        for pattern in blog_urls.urlpatterns:
+            url = reverse(
+                f"{blog_urls.app_name}:{pattern.name}",
+                kwargs={
+                    name: values[name]
+                    for name in pattern.pattern.converters
+                },
+            )
+            params = query.get(pattern.name, {})
+            for role, client in clients.items():
+                key = f"{pattern.name} ({role})"
+                results[key] = self.measure(
+                    client, url, params, options["runs"], options["cold"]
+                )
+                self.report(key, results[key])
+
+        run = {
+            "created": timezone.now().isoformat(),
+            "settings": {
+                name: getattr(settings, name)
+                for name in (
+                    "DEBUG", "CURSOR_PAGINATION", "FEED_TABLE", "POST_IN_PAGE"
+                )
+            },
+            "cold": options["cold"],
+            "runs": options["runs"],
+            "rows": {
+                model._meta.label: model.objects.count()
+                for model in (Post, Comment, Category, Location)
+            },
+            "results": results,
+        }
+        output = options["output"] or (
+            f"bench-urls-{timezone.now():%Y%m%d-%H%M%S}.json"
+        )
+        with open(output, "w", encoding="utf-8") as stream:
+            json.dump(run, stream, ensure_ascii=False, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f"Результаты записаны в {output}")
+        )
+
+        if options["compare"]:
+            self.compare(options["compare"], results)
+
+    def measure(self, client, url, params, runs, cold):
+        # Первый запрос прогревает кэши и не входит в замер.
+        response_size(client.get(url, params))
+        timings = []
+        profiles = []
+        for _ in range(runs):
+            if cold:
+                cache.clear()
+            with profile() as result:
+                started = time.perf_counter()
+                response = client.get(url, params)
+                size = response_size(response)
+                timings.append((time.perf_counter() - started) * 1000)
+            profiles.append(result)
+        return {
+            "url": url,
+            "params": params,
+            "status": response.status_code,
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+            "queries": max(result.sql_count for result in profiles),
+            "cache_queries": max(
+                result.cache_count for result in profiles
+            ),
+            "sql_ms": round(
+                statistics.median(result.sql_time for result in profiles), 3
+            ),
+            "render_ms": round(
+                statistics.median(
+                    result.render_time for result in profiles
+                ),
+                3,
+            ),
+            "bytes": size,
+        }
+
+    def report(self, key, result):
+        self.stdout.write(
+            f"{key}: {result['status']}, "
+            f"p50 {result['p50_ms']:.2f} мс, p99 {result['p99_ms']:.2f} мс, "
+            f"запросов: {result['queries']} ({result['sql_ms']:.2f} мс), "
+            f"к кэшу: {result['cache_queries']}, "
+            f"шаблоны: {result['render_ms']:.2f} мс, "
+            f"байт: {result['bytes']}"
+        )
+
+    def compare(self, path, results):
+        with open(path, encoding="utf-8") as stream:
+            previous = json.load(stream)["results"]
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Сравнение с {path}"))
+        for key, result in results.items():
+            before = previous.get(key)
+            if before is None:
+                continue
+            change = (
+                (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+                if before["p50_ms"] else 0
+            )
+            self.stdout.write(
+                f"{key}: p50 {before['p50_ms']:.2f} → "
+                f"{result['p50_ms']:.2f} мс ({change:+.0f}%), "
+                f"запросов {before['queries']} → {result['queries']}"
+            )
@@ -0,0 +1,57 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import django
+from django.core.management.base import BaseCommand
+
+from blog import feed
+from blog.cache import bump_feed_version
+from blog.models import Post
+from blog.thumbnails import generate_derivatives, mark_derivatives
+
+
+class Command(BaseCommand):
+    help = "Создаёт миниатюры для уже загруженных изображений публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Число процессов; по умолчанию — по числу ядер.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать миниатюры, даже если они уже есть.",
+        )
+
+    def handle(self, *args, **options):
+        names = list(
+            Post.objects.exclude(image="")
+            .order_by()
+            .values_list("image", flat=True)
+            .distinct()
+        )
+        processed = created = marked = 0
+        with ProcessPoolExecutor(
+            max_workers=options["processes"], initializer=django.setup
+        ) as executor:
+            for name, result in zip(names, executor.map(
+                partial(generate_derivatives, force=options["force"]),
+                names,
+                chunksize=16,
+            )):
+                processed += 1
+                created += len(result)
+                if mark_derivatives(name):
+                    feed.sync_image(name)
+                    marked += 1
+        if marked:
+            bump_feed_version()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Изображений обработано: {processed}, "
+                f"файлов создано: {created}"
+            )
+        )
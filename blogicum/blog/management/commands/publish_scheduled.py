@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.scheduling import next_pub_date, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Делает видимыми отложенные публикации, время которых наступило, "
+        "и сбрасывает кэши лент."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно, просыпаясь к ближайшей публикации.",
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=60.0,
+            help="Максимальная пауза между проверками, в секундах.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            changed = publish_due_posts()
+            if changed:
+                self.stdout.write(f"Обновлено публикаций: {changed}")
+            if not options["loop"]:
+                return
+            time.sleep(self.sleep_seconds(options["max_sleep"]))
+
+    def sleep_seconds(self, max_sleep):
+        upcoming = next_pub_date()
+        if upcoming is None:
+            return max_sleep
+        return min(
+            max_sleep,
+            max((upcoming - timezone.now()).total_seconds(), 0) + 0.01,
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog import feed
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересобирает денормализованную таблицу ленты FeedEntry "
+        "из видимых публикаций."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько записей вставлять за один запрос.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            created = feed.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Записей в ленте: {created}")
+        )
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = "Пересобирает полнотекстовые индексы публикаций и комментариев."
+
+    def handle(self, *args, **options):
+        for index in (search.POST_INDEX, search.COMMENT_INDEX):
+            search.rebuild_index(index=index)
+        self.stdout.write(self.style.SUCCESS("Поисковые индексы пересобраны"))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает денормализованный счётчик комментариев у публикаций "
+        "и исправляет расхождения."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Только показать число расхождений, ничего не меняя.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько публикаций исправлять за одну транзакцию.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            Post.objects.with_comment_count_drift()
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        if options["check"]:
+            self.stdout.write(
+                f"Публикаций с неверным счётчиком: {drifted.count()}"
+            )
+            return
+
+        batch_size = options["batch_size"]
+        fixed = 0
+        last_pk = 0
+        while True:
+            batch = list(drifted.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                fixed += Post.objects.filter(
+                    pk__in=batch
+                ).recount_comments()
+            last_pk = batch[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f"Исправлено счётчиков: {fixed}")
+        )
@@ -0,0 +1,246 @@
+import math
+import random
+from datetime import timedelta
+from io import BytesIO
+from itertools import accumulate, islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from jobs.queue import enqueue
+from PIL import Image
+
+from blog.cache import bump_feed_version
+from blog.lookups import invalidate_lookups
+from blog.models import Category, Comment, Location, Post, make_excerpt
+from blog.scheduling import next_pub_date
+from blog.thumbnails import generate_derivatives, mark_derivatives
+from core.bulk import bulk_insert
+
+User = get_user_model()
+
+PREFIX = "seed"
+
+WORDS = (
+    "город утро дорога река лес поезд книга кофе музей парк море гора "
+    "мост вечер дождь снег солнце улица рынок театр площадь остров "
+    "берег ветер озеро сад дом окно путь история встреча фотография"
+).split()
+
+
+def zipf_weights(count, exponent):
+    """Накопленные веса закона Ципфа: первые элементы выпадают чаще всех."""
+    return list(accumulate(1 / rank ** exponent
+                           for rank in range(1, count + 1)))
+
+
+def sentence(rng, words):
+    return " ".join(rng.choices(WORDS, k=words)).capitalize()
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу синтетическими пользователями, публикациями "
+        "и комментариями с реалистичным перекосом: немногие авторы пишут "
+        "большую часть публикаций, немногие публикации собирают большую "
+        "часть комментариев. Строки вставляются через bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--posts", type=int, default=10000)
+        parser.add_argument("--comments", type=int, default=50000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--locations", type=int, default=50)
+        parser.add_argument(
+            "--images",
+            type=float,
+            default=0.3,
+            help="Доля публикаций с изображением.",
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Показатель закона Ципфа для авторов и публикаций.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Начальное значение генератора случайных чисел.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.skew = options["skew"]
+        if options["posts"] and not (options["users"]
+                                     and options["categories"]):
+            raise CommandError(
+                "Для публикаций нужны хотя бы один пользователь "
+                "и одна категория."
+            )
+        # Метка прогона отличает имена и slug от строк прошлых запусков.
+        run = f"{PREFIX}{timezone.now():%Y%m%d%H%M%S}"
+
+        user_ids = self.create_users(run, options["users"])
+        categories = self.create_categories(run, options["categories"])
+        location_ids = self.create_locations(options["locations"])
+        images = self.create_images(run) if options["images"] else []
+        post_ids = self.create_posts(
+            options["posts"],
+            user_ids,
+            categories,
+            location_ids,
+            images,
+            options["images"],
+        )
+        self.create_comments(options["comments"], post_ids, user_ids)
+        for name in images:
+            mark_derivatives(name)
+
+        call_command("recount_comments", stdout=self.stdout)
+        pub_date = next_pub_date()
+        if pub_date is not None:
+            delay = (pub_date - timezone.now()).total_seconds()
+            enqueue("blog.publish_scheduled", delay=max(math.ceil(delay), 0))
+        if settings.FEED_TABLE:
+            call_command("rebuild_feed", stdout=self.stdout)
+        bump_feed_version()
+        invalidate_lookups()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано пользователей: {len(user_ids)}, "
+                f"публикаций: {len(post_ids)}, "
+                f"комментариев: {options['comments']}"
+            )
+        )
+
+    def bulk_create(self, model, objects):
+        """Вставляет строки пачками и возвращает их id."""
+        objects = iter(objects)
+        pks = []
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                return pks
+            with transaction.atomic():
+                pks.extend(obj.pk for obj in bulk_insert(model, batch))
+
+    def create_users(self, run, count):
+        return self.bulk_create(
+            User,
+            (
+                User(
+                    username=f"{run}_user_{number}",
+                    password=f"{UNUSABLE_PASSWORD_PREFIX}{run}",
+                    first_name=sentence(self.rng, 1),
+                )
+                for number in range(count)
+            ),
+        )
+
+    def create_categories(self, run, count):
+        # Каждая десятая категория снята с публикации.
+        return self.bulk_create(
+            Category,
+            (
+                Category(
+                    title=sentence(self.rng, 2),
+                    description=sentence(self.rng, 8),
+                    slug=f"{run}-{number}",
+                    is_published=number % 10 != 9,
+                )
+                for number in range(count)
+            ),
+        )
+
+    def create_locations(self, count):
+        return self.bulk_create(
+            Location,
+            (
+                Location(name=f"{sentence(self.rng, 1)} {number}")
+                for number in range(count)
+            ),
+        )
+
+    def create_images(self, run, count=10):
+        names = []
+        for number in range(count):
+            name = f"{PREFIX}/{run}_{number}.jpg"
+            color = tuple(self.rng.randrange(256) for _ in range(3))
+            buffer = BytesIO()
+            Image.new("RGB", (1600, 1200), color).save(buffer, "JPEG")
+            names.append(
+                default_storage.save(name, ContentFile(buffer.getvalue()))
+            )
+            generate_derivatives(names[-1])
+        return names
+
+    def create_posts(self, count, user_ids, categories, location_ids,
+                     images, image_share):
+        rng = self.rng
+        now = timezone.now()
+        authors = zipf_weights(len(user_ids), self.skew)
+
+        def posts():
+            for _ in range(count):
+                text = "\n".join(
+                    sentence(rng, rng.randint(8, 30))
+                    for _ in range(rng.randint(1, 8))
+                )
+                # Несколько процентов публикаций — черновики
+                # и отложенные на будущее.
+                pub_date = now - timedelta(
+                    minutes=rng.randint(-60 * 24 * 7, 60 * 24 * 365)
+                )
+                is_published = rng.random() > 0.03
+                yield Post(
+                    author_id=rng.choices(user_ids, cum_weights=authors)[0],
+                    category_id=rng.choice(categories),
+                    location_id=(
+                        rng.choice(location_ids)
+                        if location_ids and rng.random() < 0.7 else None
+                    ),
+                    title=sentence(rng, rng.randint(2, 6)),
+                    text=text,
+                    excerpt=make_excerpt(text),
+                    pub_date=pub_date,
+                    is_published=is_published,
+                    is_visible=is_published and pub_date <= now,
+                    image=(
+                        rng.choice(images)
+                        if images and rng.random() < image_share else ""
+                    ),
+                )
+
+        return self.bulk_create(Post, posts())
+
+    def create_comments(self, count, post_ids, user_ids):
+        if not post_ids:
+            return
+        rng = self.rng
+        # Горячие публикации разбросаны по всей ленте, а не только
+        # среди первых созданных.
+        hot_posts = post_ids[:]
+        rng.shuffle(hot_posts)
+        weights = zipf_weights(len(hot_posts), self.skew)
+        self.bulk_create(
+            Comment,
+            (
+                Comment(
+                    post_id=rng.choices(hot_posts, cum_weights=weights)[0],
+                    author_id=rng.choice(user_ids),
+                    text=sentence(rng, rng.randint(3, 25)),
+                )
+                for _ in range(count)
+            ),
+        )
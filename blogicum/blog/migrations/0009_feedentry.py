@@ -0,0 +1,87 @@
+# Generated by Django 3.2.16 on 2026-10-18 06:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("blog", "0008_post_is_visible"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedEntry",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="feed_entry",
+                        serialize=False,
+                        to="blog.post",
+                        verbose_name="публикация",
+                    ),
+                ),
+                ("pub_date", models.DateTimeField()),
+                ("title", models.CharField(max_length=256)),
+                ("excerpt", models.TextField(blank=True)),
+                ("author_username", models.CharField(max_length=150)),
+                ("category_slug", models.SlugField()),
+                ("category_title", models.CharField(max_length=256)),
+                ("location_name", models.CharField(blank=True, max_length=256)),
+                ("image_url", models.CharField(blank=True, max_length=256)),
+                ("thumbnail_url", models.CharField(blank=True, max_length=256)),
+                ("thumbnail_webp_url", models.CharField(blank=True, max_length=256)),
+                ("comment_count", models.PositiveIntegerField(default=0)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="blog.category",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="blog.location",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "запись ленты",
+                "verbose_name_plural": "Записи ленты",
+                "ordering": ("-pub_date",),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="feedentry",
+            index=models.Index(fields=["-pub_date", "-post"], name="feed_pub_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="feedentry",
+            index=models.Index(
+                fields=["category", "-pub_date"], name="feed_category_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedentry",
+            index=models.Index(fields=["author", "-pub_date"], name="feed_author_idx"),
+        ),
+    ]
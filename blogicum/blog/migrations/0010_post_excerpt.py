@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-18 06:31
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    batch = []
+    for post in Post.objects.only("pk", "text").iterator(chunk_size=1000):
+        post.excerpt = Truncator(post.text).words(10)
+        batch.append(post)
+        if len(batch) >= 1000:
+            Post.objects.bulk_update(batch, ["excerpt"])
+            batch = []
+    Post.objects.bulk_update(batch, ["excerpt"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_feedentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Первые слова текста для карточки в ленте.",
+                verbose_name="Отрывок",
+            ),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
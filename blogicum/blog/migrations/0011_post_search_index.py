@@ -0,0 +1,65 @@
+# Generated by Django 3.2.16 on 2026-10-18 06:40
+
+from django.db import migrations
+
+# SQL зафиксирован здесь, а не берётся из blog.search, чтобы
+# изменения модуля не меняли уже применённую миграцию.
+SCHEMA = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE blog_post_fts USING fts5(title, text, "
+        "content='blog_post', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post "
+        "BEGIN INSERT INTO blog_post_fts(rowid, title, text) "
+        "VALUES (new.id, new.title, new.text); END",
+        "CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post "
+        "BEGIN INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) "
+        "VALUES ('delete', old.id, old.title, old.text); END",
+        "CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text "
+        "ON blog_post "
+        "BEGIN INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) "
+        "VALUES ('delete', old.id, old.title, old.text); "
+        "INSERT INTO blog_post_fts(rowid, title, text) "
+        "VALUES (new.id, new.title, new.text); END",
+        "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')",
+    ),
+    "postgresql": (
+        "CREATE INDEX blog_post_search_idx ON blog_post USING GIN "
+        "(to_tsvector('russian', coalesce(blog_post.title, '') "
+        "|| ' ' || coalesce(blog_post.text, '')))",
+    ),
+}
+
+DROP = {
+    "sqlite": (
+        "DROP TRIGGER IF EXISTS blog_post_fts_update",
+        "DROP TRIGGER IF EXISTS blog_post_fts_delete",
+        "DROP TRIGGER IF EXISTS blog_post_fts_insert",
+        "DROP TABLE IF EXISTS blog_post_fts",
+    ),
+    "postgresql": ("DROP INDEX IF EXISTS blog_post_search_idx",),
+}
+
+
+def execute(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    execute(schema_editor, SCHEMA)
+
+
+def drop_search_index(apps, schema_editor):
+    execute(schema_editor, DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_post_excerpt"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
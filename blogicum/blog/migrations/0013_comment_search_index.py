@@ -0,0 +1,64 @@
+# Generated by Django 3.2.16 on 2026-10-18 06:52
+
+from django.db import migrations
+
+# SQL зафиксирован здесь, а не берётся из blog.search, чтобы
+# изменения модуля не меняли уже применённую миграцию.
+SCHEMA = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE blog_comment_fts USING fts5(text, "
+        "content='blog_comment', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER blog_comment_fts_insert AFTER INSERT ON blog_comment "
+        "BEGIN INSERT INTO blog_comment_fts(rowid, text) "
+        "VALUES (new.id, new.text); END",
+        "CREATE TRIGGER blog_comment_fts_delete AFTER DELETE ON blog_comment "
+        "BEGIN INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); END",
+        "CREATE TRIGGER blog_comment_fts_update AFTER UPDATE OF text "
+        "ON blog_comment "
+        "BEGIN INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        "INSERT INTO blog_comment_fts(rowid, text) "
+        "VALUES (new.id, new.text); END",
+        "INSERT INTO blog_comment_fts(blog_comment_fts) VALUES ('rebuild')",
+    ),
+    "postgresql": (
+        "CREATE INDEX blog_comment_search_idx ON blog_comment USING GIN "
+        "(to_tsvector('russian', coalesce(blog_comment.text, '')))",
+    ),
+}
+
+DROP = {
+    "sqlite": (
+        "DROP TRIGGER IF EXISTS blog_comment_fts_update",
+        "DROP TRIGGER IF EXISTS blog_comment_fts_delete",
+        "DROP TRIGGER IF EXISTS blog_comment_fts_insert",
+        "DROP TABLE IF EXISTS blog_comment_fts",
+    ),
+    "postgresql": ("DROP INDEX IF EXISTS blog_comment_search_idx",),
+}
+
+
+def execute(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    execute(schema_editor, SCHEMA)
+
+
+def drop_search_index(apps, schema_editor):
+    execute(schema_editor, DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_admin_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 3.2.16 on 2026-10-18 07:05
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+# Триггеры полнотекстовых индексов на момент этой миграции.
+SEARCH_TRIGGERS = (
+    "DROP TRIGGER IF EXISTS blog_post_fts_update",
+    "DROP TRIGGER IF EXISTS blog_post_fts_delete",
+    "DROP TRIGGER IF EXISTS blog_post_fts_insert",
+    "CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post "
+    "BEGIN INSERT INTO blog_post_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post "
+    "BEGIN INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); END",
+    "CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text "
+    "ON blog_post "
+    "BEGIN INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); "
+    "INSERT INTO blog_post_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')",
+    "DROP TRIGGER IF EXISTS blog_comment_fts_update",
+    "DROP TRIGGER IF EXISTS blog_comment_fts_delete",
+    "DROP TRIGGER IF EXISTS blog_comment_fts_insert",
+    "CREATE TRIGGER blog_comment_fts_insert AFTER INSERT ON blog_comment "
+    "BEGIN INSERT INTO blog_comment_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "CREATE TRIGGER blog_comment_fts_delete AFTER DELETE ON blog_comment "
+    "BEGIN INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER blog_comment_fts_update AFTER UPDATE OF text "
+    "ON blog_comment "
+    "BEGIN INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO blog_comment_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "INSERT INTO blog_comment_fts(blog_comment_fts) VALUES ('rebuild')",
+)
+
+
+def fill_updated_at(apps, schema_editor):
+    for model_name in ("category", "location", "post", "comment"):
+        model = apps.get_model("blog", model_name)
+        model.objects.update(updated_at=F("created_at"))
+
+
+def restore_search_indexes(apps, schema_editor):
+    # SQLite выполняет AddField/RemoveField пересозданием таблицы,
+    # при котором теряются триггеры полнотекстовых индексов.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in SEARCH_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0013_comment_search_index"),
+    ]
+
+    operations = [
+        # При откате поля удаляются после этой операции.
+        migrations.RunPython(migrations.RunPython.noop, restore_search_indexes),
+        migrations.AddField(
+            model_name="category",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Изменено",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Изменено",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Изменено",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Изменено",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(restore_search_indexes, migrations.RunPython.noop),
+    ]
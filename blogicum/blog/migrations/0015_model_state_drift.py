@@ -0,0 +1,52 @@
+# Generated by Django 3.2.16 on 2026-10-18 07:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Параметры моделей, изменённые в исходном коде без миграции;
+# вынесены из 0006, чтобы она содержала только счётчик комментариев.
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("blog", "0014_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="category",
+            options={
+                "ordering": ("created_at",),
+                "verbose_name": "категория",
+                "verbose_name_plural": "Категории",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="location",
+            options={
+                "ordering": ("created_at",),
+                "verbose_name": "местоположение",
+                "verbose_name_plural": "Местоположения",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="post",
+            options={
+                "default_related_name": "posts",
+                "ordering": ("-pub_date",),
+                "verbose_name": "публикация",
+                "verbose_name_plural": "Публикации",
+            },
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="author",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="profile",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Автор публикации",
+            ),
+        ),
+    ]
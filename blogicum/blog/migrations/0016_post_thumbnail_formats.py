@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-18 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0015_model_state_drift"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_formats",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Готовые миниатюры изображения через пробел.",
+                max_length=32,
+                verbose_name="Форматы миниатюр",
+            ),
+        ),
+    ]
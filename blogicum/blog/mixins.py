@@ -1,13 +1,37 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.db.models import DateTimeField, F, Func
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
-from blog.models import Comment
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from blog.models import Comment, FeedEntry
+from blog.cache import (feed_cache_timeout, feed_page_key, feed_version,
+                        get_last_modified)
 from blog.form import CommentForm
+from blog.lookups import attach_lookups
+from blog.paginators import CursorPaginator
+
+
+class ObjectCacheMixin:
+    """Запоминает объект, чтобы проверка прав и сама CBV
+    не загружали его из базы дважды.
+    """
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object(queryset)
+        return self._object
 
 
 class AuthorTestMixin(UserPassesTestMixin):
     def test_func(self):
-        return self.get_object().author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
@@ -34,3 +58,149 @@ class CommentUpdateMixin:
     form_class = CommentForm
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
+
+    def get_queryset(self):
+        return Comment.objects.filter(post_id=self.kwargs['post_id'])
+
+
+class CursorPaginationMixin:
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        if not settings.CURSOR_PAGINATION:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class FeedCacheMixin:
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+
+        key = feed_page_key(
+            request.get_full_path(), getattr(self, 'feed_version', None)
+        )
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content)
+
+        response = super().get(request, *args, **kwargs)
+
+        def store(response):
+            if (response.status_code == 200
+                    and not request.META.get('CSRF_COOKIE_USED')):
+                cache.set(key, response.content, feed_cache_timeout())
+
+        response.add_post_render_callback(store)
+        return response
+
+
+class PostLookupsMixin:
+    def attach_lookups(self, page):
+        attach_lookups(page)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        self.attach_lookups(context['page_obj'])
+        return context
+
+
+class FeedTableMixin(PostLookupsMixin):
+    """Читает ленту из FeedEntry, если включена настройка FEED_TABLE.
+
+    Записи уже содержат всё, что нужно карточке, поэтому страница
+    выбирается одним запросом по индексу без соединений.
+    """
+
+    feed_card_template = 'includes/feed_card.html'
+
+    def get_feed_queryset(self):
+        return FeedEntry.objects.all()
+
+    def get_post_queryset(self):
+        return super().get_queryset()
+
+    def get_queryset(self):
+        if settings.FEED_TABLE:
+            return self.get_feed_queryset()
+        return self.get_post_queryset()
+
+    def attach_lookups(self, page):
+        if not settings.FEED_TABLE:
+            super().attach_lookups(page)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if settings.FEED_TABLE:
+            context['card_template'] = self.feed_card_template
+        return context
+
+
+def latest_change(*sources):
+    """Наибольшее значение среди пар (queryset, поле даты) или None.
+
+    Максимумы всех источников выбираются одним запросом UNION ALL.
+    MAX() здесь обычная функция, а не агрегат, чтобы values() не
+    добавлял GROUP BY.
+    """
+    parts = [
+        queryset.order_by().values(
+            latest=Func(F(field), function='MAX',
+                        output_field=DateTimeField())
+        )
+        for queryset, field in sources
+    ]
+    values = parts[0].union(*parts[1:], all=True).values_list(
+        'latest', flat=True
+    )
+    return max((value for value in values if value), default=None)
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 без отрисовки шаблона, если страница не менялась.
+
+    ETag строится из версии ленты, пользователя и адреса страницы
+    и не требует запросов к базе; Last-Modified вычисляется
+    в get_last_modified() и кэшируется под этим ETag.
+
+    304 отдаётся только по If-None-Match: Last-Modified не сдвигается
+    при удалениях и правках, которые меняют лишь версию ленты, поэтому
+    одного If-Modified-Since недостаточно.
+    """
+
+    def get_etag_parts(self):
+        return [
+            self.feed_version,
+            self.request.user.pk or '',
+            self.request.get_full_path(),
+        ]
+
+    def get_etag(self):
+        parts = ':'.join(str(part) for part in self.get_etag_parts())
+        return quote_etag(hashlib.md5(parts.encode()).hexdigest())
+
+    def get_last_modified(self):
+        return None
+
+    def get(self, request, *args, **kwargs):
+        # Версия нужна и ETag, и ключу страницы в FeedCacheMixin;
+        # читается из кэша один раз за запрос.
+        self.feed_version = feed_version()
+        etag = self.get_etag()
+        last_modified = get_last_modified(etag, self.get_last_modified)
+        self.last_modified = last_modified
+        timestamp = (
+            int(last_modified.timestamp()) if last_modified else None
+        )
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response.headers['ETag'] = etag
+        if timestamp is not None:
+            response.headers['Last-Modified'] = http_date(timestamp)
+        return response
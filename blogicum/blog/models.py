@@ -1,14 +1,23 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.text import Truncator
 
 from core.models import PublishedModel
-from .querysets import PostsQuerySet
+from .querysets import CategoryQuerySet, PostsQuerySet
+from .search import POST_INDEX
+from .thumbnails import derivative_url
 
 MAX_LENGTH = 256
+EXCERPT_WORDS = 10
 
 User = get_user_model()
 
 
+def make_excerpt(text):
+    return Truncator(text).words(EXCERPT_WORDS)
+
+
 class Category(PublishedModel):
     title = models.CharField(
         max_length=MAX_LENGTH, blank=False, verbose_name="Заголовок"
@@ -21,6 +30,7 @@ class Category(PublishedModel):
         "разрешены символы латиницы, цифры, дефис и подчёркивание.",
         verbose_name="Идентификатор",
     )
+    objects = CategoryQuerySet.as_manager()
 
     class Meta(PublishedModel.Meta):
         verbose_name = "категория"
@@ -77,7 +87,30 @@ class Post(PublishedModel):
         help_text="Если установить дату и время "
         "в будущем — можно делать отложенные публикации.",
     )
+    excerpt = models.TextField(
+        "Отрывок",
+        blank=True,
+        editable=False,
+        help_text="Первые слова текста для карточки в ленте.",
+    )
     image = models.ImageField("Фото", blank=True)
+    thumbnail_formats = models.CharField(
+        "Форматы миниатюр",
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text="Готовые миниатюры изображения через пробел.",
+    )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев", default=0, editable=False
+    )
+    is_visible = models.BooleanField(
+        "Видна в лентах",
+        default=False,
+        editable=False,
+        help_text="Опубликована и время публикации наступило; "
+        "для отложенных публикаций выставляется планировщиком.",
+    )
     objects = PostsQuerySet.as_manager()
 
     class Meta(PublishedModel.Meta):
@@ -85,10 +118,73 @@ class Post(PublishedModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
+        indexes = [
+            models.Index(
+                fields=['is_visible', '-pub_date'],
+                name='post_visible_pub_date_idx',
+            ),
+            # Частичный индекс: условие is_visible в Django 3.2 попадает
+            # в SQLite без «= 1», и колонка is_visible внутри составного
+            # индекса не давала использовать его для ORDER BY.
+            models.Index(
+                fields=['category', '-pub_date', '-id'],
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='post_author_pub_date_idx',
+            ),
+            models.Index(
+                fields=['-pub_date', '-id'],
+                condition=models.Q(is_visible=True),
+                name='post_visible_feed_idx',
+            ),
+            # Сортировка и date_hierarchy в админке.
+            models.Index(fields=['-pub_date'], name='post_pub_date_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def _derivative_url(self, ext):
+        if self.image and ext in self.thumbnail_formats.split():
+            return derivative_url(self.image.name, ext)
+        return None
+
+    @property
+    def thumbnail_url(self):
+        if not self.image:
+            return None
+        return self._derivative_url('jpg') or self.image.url
+
+    @property
+    def thumbnail_webp_url(self):
+        return self._derivative_url('webp')
+
+    def save(self, *args, **kwargs):
+        self.is_visible = (
+            self.is_published and self.pub_date <= timezone.now()
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt = make_excerpt(self.text)
+        if update_fields is not None:
+            if {'is_published', 'pub_date'} & set(update_fields):
+                update_fields = {*update_fields, 'is_visible'}
+            if 'text' in update_fields:
+                update_fields = {*update_fields, 'excerpt'}
+            kwargs['update_fields'] = update_fields
+        # Счётчик комментариев меняется только атомарными UPDATE,
+        # поэтому устаревший экземпляр не должен его перезаписывать.
+        if (not self._state.adding and self.pk is not None
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'comment_count'
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(PublishedModel):
     post = models.ForeignKey(
@@ -105,6 +201,87 @@ class Comment(PublishedModel):
     class Meta(PublishedModel.Meta):
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = [
+            models.Index(
+                fields=["created_at"], name="comment_created_at_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Комментарий пользователя {self.author}"
+
+
+class FeedEntry(models.Model):
+    """Денормализованная строка ленты для видимой публикации.
+
+    Заполняется сигналами и командой rebuild_feed, если включена
+    настройка FEED_TABLE.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="feed_entry",
+        verbose_name="публикация",
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="+"
+    )
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+"
+    )
+    location = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    pub_date = models.DateTimeField()
+    title = models.CharField(max_length=MAX_LENGTH)
+    excerpt = models.TextField(blank=True)
+    author_username = models.CharField(max_length=150)
+    category_slug = models.SlugField()
+    category_title = models.CharField(max_length=MAX_LENGTH)
+    location_name = models.CharField(max_length=MAX_LENGTH, blank=True)
+    image_url = models.CharField(max_length=MAX_LENGTH, blank=True)
+    thumbnail_url = models.CharField(max_length=MAX_LENGTH, blank=True)
+    thumbnail_webp_url = models.CharField(max_length=MAX_LENGTH, blank=True)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ('-pub_date',)
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи ленты'
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-post'], name='feed_pub_date_idx'
+            ),
+            models.Index(
+                fields=['category', '-pub_date'], name='feed_category_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date'], name='feed_author_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class PostSearchDocument(models.Model):
+    """Строка поискового индекса FTS5 публикации.
+
+    Таблица есть только в SQLite, её создаёт миграция 0011; модель нужна,
+    чтобы соединять с ней публикации средствами ORM.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_document',
+    )
+
+    class Meta:
+        managed = False
+        db_table = POST_INDEX.fts_table
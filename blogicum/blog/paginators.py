@@ -0,0 +1,198 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.paginator import InvalidPage, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def encode_cursor(value, pk, backwards=False):
+    payload = json.dumps(
+        [value.isoformat(), pk, int(backwards)], separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        value, pk, backwards = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        value = parse_datetime(value)
+    except (binascii.Error, TypeError, ValueError):
+        raise InvalidCursor('Неверный курсор')
+    if value is None or not isinstance(pk, int):
+        raise InvalidCursor('Неверный курсор')
+    return value, pk, bool(backwards)
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not (self._has_next and self.object_list):
+            return None
+        return self.paginator.cursor_for(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not (self._has_previous and self.object_list):
+            return None
+        return self.paginator.cursor_for(
+            self.object_list[0], backwards=True
+        )
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу (key_field, id) без OFFSET и COUNT."""
+
+    is_cursor_based = True
+
+    def __init__(self, object_list, per_page, key_field='pub_date',
+                 descending=True):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.key_field = key_field
+        self.descending = descending
+
+    def cursor_for(self, item, backwards=False):
+        # Строки из values() приходят словарями.
+        if isinstance(item, dict):
+            value, pk = item[self.key_field], item['id']
+        else:
+            value, pk = getattr(item, self.key_field), item.pk
+        return encode_cursor(value, pk, backwards)
+
+    def _after(self, value, pk, descending):
+        lookup = 'lt' if descending else 'gt'
+        return self.object_list.filter(
+            Q(**{f'{self.key_field}__{lookup}': value})
+            | Q(**{self.key_field: value, f'pk__{lookup}': pk})
+        )
+
+    def _ordered(self, queryset, descending):
+        prefix = '-' if descending else ''
+        return queryset.order_by(f'{prefix}{self.key_field}', f'{prefix}pk')
+
+    def page(self, cursor=None):
+        if not cursor:
+            rows = list(
+                self._ordered(self.object_list, self.descending)
+                [:self.per_page + 1]
+            )
+            return CursorPage(
+                rows[:self.per_page], self,
+                has_next=len(rows) > self.per_page, has_previous=False,
+            )
+
+        value, pk, backwards = decode_cursor(cursor)
+        if backwards:
+            descending = not self.descending
+            rows = list(
+                self._ordered(self._after(value, pk, descending), descending)
+                [:self.per_page + 1]
+            )
+            return CursorPage(
+                rows[:self.per_page][::-1], self,
+                has_next=True, has_previous=len(rows) > self.per_page,
+            )
+
+        rows = list(
+            self._ordered(
+                self._after(value, pk, self.descending), self.descending
+            )[:self.per_page + 1]
+        )
+        return CursorPage(
+            rows[:self.per_page], self,
+            has_next=len(rows) > self.per_page, has_previous=True,
+        )
+
+
+class WindowedPaginator(Paginator):
+    """Paginator, у которого в шаблоне выводится только окно страниц."""
+
+    on_each_side = 2
+    on_ends = 1
+
+    def page_window(self, number):
+        return self.get_elided_page_range(
+            number, on_each_side=self.on_each_side, on_ends=self.on_ends
+        )
+
+
+def estimate_row_count(model, using='default'):
+    """Оценка числа строк таблицы по статистике СУБД или None."""
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass'
+    elif connection.vendor == 'sqlite':
+        # Первое число в sqlite_stat1.stat — число строк; таблица
+        # появляется после ANALYZE.
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1'
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator для больших таблиц в админке.
+
+    Для запроса без условий число строк берётся из статистики СУБД
+    вместо COUNT(*); точный подсчёт выполняется, только если оценки
+    нет или она меньше ADMIN_EXACT_COUNT_LIMIT.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimate_row_count(
+                self.object_list.model, self.object_list.db
+            )
+            if (estimate is not None
+                    and estimate >= settings.ADMIN_EXACT_COUNT_LIMIT):
+                return estimate
+        return super().count
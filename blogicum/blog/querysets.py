@@ -1,18 +1,164 @@
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import Count
-from django.db import models
+from django.db.models import (BooleanField, Case, Count, F, OuterRef, Q,
+                              Subquery, Value, When)
+from django.db.models.expressions import Combinable
+from django.db.models.functions import Coalesce, Greatest
+from core.models import PublishedQuerySet
 
 
-class PostsQuerySet(models.QuerySet):
+def published_q():
+    return Q(is_visible=True, category__is_published=True)
+
+
+def _new_value_q(value, lookup, literal):
+    """Условие на значение, которое UPDATE записывает в колонку."""
+    if isinstance(value, F):
+        return Q(**{f"{value.name}{lookup}": literal})
+    if isinstance(value, Combinable):
+        raise ValueError(
+            "Видимость нельзя вычислить по выражению; передайте is_visible."
+        )
+    return None
+
+
+class CategoryQuerySet(PublishedQuerySet):
+    def update(self, **kwargs):
+        if "is_published" not in kwargs:
+            return super().update(**kwargs)
+        from . import feed
+        from .cache import bump_feed_version
+        from .lookups import invalidate_lookups
+
+        # UPDATE обходит сигналы, которые обновляют ленту при сохранении.
+        categories = list(self)
+        changed = super().update(**kwargs)
+        for category in categories:
+            category.is_published = kwargs["is_published"]
+            feed.sync_category(category)
+        bump_feed_version()
+        invalidate_lookups()
+        return changed
+
+
+class PostsQuerySet(PublishedQuerySet):
+    def update(self, **kwargs):
+        if ({"is_published", "pub_date"} & kwargs.keys()
+                and "is_visible" not in kwargs):
+            kwargs["is_visible"] = self._visibility_after(kwargs)
+        if "is_visible" not in kwargs:
+            return super().update(**kwargs)
+        from . import feed
+        from .cache import bump_feed_version, invalidate_profile_card
+
+        # UPDATE обходит сигналы, которые обновляют ленту при сохранении.
+        rows = list(self.values_list("pk", "author_id"))
+        changed = super().update(**kwargs)
+        if rows:
+            feed.sync_posts(pk for pk, _ in rows)
+            bump_feed_version()
+            for author_id in {author_id for _, author_id in rows}:
+                invalidate_profile_card(author_id)
+        return changed
+
+    def _visibility_after(self, values):
+        """Значение is_visible для UPDATE is_published или pub_date.
+
+        В правой части SET видны прежние значения колонок, поэтому
+        видимость считается по значениям из самого UPDATE.
+        """
+        # Now() в SQLite отбрасывает доли секунды и сравнивается
+        # с сохранёнными датами как строка, поэтому время берётся здесь.
+        now = timezone.now()
+        condition = Q()
+        if "is_published" in values:
+            value = values["is_published"]
+            published = _new_value_q(value, "", True)
+            if published is None and not value:
+                return False
+            condition &= published or Q()
+        else:
+            condition &= Q(is_published=True)
+        if "pub_date" in values:
+            value = values["pub_date"]
+            due = _new_value_q(value, "__lte", now)
+            if due is None and value > now:
+                return False
+            condition &= due or Q()
+        else:
+            condition &= Q(pub_date__lte=now)
+        if not condition:
+            return True
+        return Case(
+            When(condition, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+
     def post_select_related(self):
         return self.select_related("location", "category", "author")
 
     def published(self):
+        return self.filter(published_q())
+
+    def visible_to(self, user):
+        condition = published_q()
+        if user.is_authenticated:
+            condition |= Q(author=user)
+        return self.filter(condition).post_select_related()
+
+    def due_for_publication(self):
         return self.filter(
-            is_published=True, category__is_published=True,
-            pub_date__lt=timezone.now()
-        ).post_select_related()
+            is_published=True, is_visible=False, pub_date__lte=timezone.now()
+        )
+
+    def stale_visibility(self):
+        return self.filter(is_visible=True).filter(
+            Q(is_published=False) | Q(pub_date__gt=timezone.now())
+        )
+
+    def _feed_entries(self):
+        feed_entry_model = self.model._meta.get_field(
+            'feed_entry'
+        ).related_model
+        return feed_entry_model.objects.filter(post__in=self.values('pk'))
+
+    def change_comment_count(self, delta):
+        changed = self.update(
+            comment_count=Greatest(F('comment_count') + delta, Value(0))
+        )
+        if settings.FEED_TABLE:
+            self._feed_entries().update(
+                comment_count=Greatest(F('comment_count') + delta, Value(0))
+            )
+        return changed
+
+    def _actual_comment_count(self):
+        comment_model = self.model._meta.get_field('comments').related_model
+        return Coalesce(
+            Subquery(
+                comment_model.objects.filter(post=OuterRef('pk'))
+                .order_by()
+                .values('post')
+                .annotate(count=Count('pk'))
+                .values('count')
+            ),
+            Value(0),
+        )
+
+    def with_comment_count_drift(self):
+        return (
+            self.annotate(actual_comment_count=self._actual_comment_count())
+            .exclude(comment_count=F('actual_comment_count'))
+        )
 
-    def annotate_comments(self):
-        return (self.annotate(comment_count=Count('comments'))
-                .order_by('-pub_date'))
+    def recount_comments(self):
+        changed = self.update(comment_count=self._actual_comment_count())
+        if settings.FEED_TABLE:
+            self._feed_entries().update(
+                comment_count=Subquery(
+                    self.model.objects.filter(pk=OuterRef('post'))
+                    .values('comment_count')
+                )
+            )
+        return changed
@@ -0,0 +1,26 @@
+from django.utils import timezone
+
+from .models import Post
+
+
+def publish_due_posts():
+    """Пересчитывает флаг is_visible у публикаций, время которых наступило.
+
+    Возвращает число изменённых публикаций.
+    """
+    # update() сам обновляет ленту и сбрасывает кэши изменённых публикаций.
+    return (
+        Post.objects.due_for_publication().update(is_visible=True)
+        + Post.objects.stale_visibility().update(is_visible=False)
+    )
+
+
+def next_pub_date():
+    return (
+        Post.objects.filter(
+            is_published=True, is_visible=False, pub_date__gt=timezone.now()
+        )
+        .order_by("pub_date")
+        .values_list("pub_date", flat=True)
+        .first()
+    )
@@ -0,0 +1,246 @@
+"""Полнотекстовый поиск по публикациям и комментариям.
+
+В SQLite используются виртуальные таблицы FTS5, которые триггеры
+синхронизируют с исходными таблицами; в PostgreSQL — GIN-индексы
+по tsvector.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+PG_CONFIG = "russian"
+
+
+class SearchIndex:
+    def __init__(self, table, columns, weights=None):
+        self.table = table
+        self.columns = columns
+        self.weights = weights or (1.0,) * len(columns)
+        self.fts_table = f"{table}_fts"
+
+    @property
+    def pg_index(self):
+        return f"{self.table}_search_idx"
+
+    @property
+    def pg_document(self):
+        document = " || ' ' || ".join(
+            f"coalesce({self.table}.{column}, '')" for column in self.columns
+        )
+        return f"to_tsvector('{PG_CONFIG}', {document})"
+
+    @property
+    def sqlite_triggers(self):
+        fts = self.fts_table
+        return (f"{fts}_insert", f"{fts}_delete", f"{fts}_update")
+
+    def sqlite_trigger_schema(self):
+        fts = self.fts_table
+        columns = ", ".join(self.columns)
+        old = ", ".join(f"old.{column}" for column in self.columns)
+        new = ", ".join(f"new.{column}" for column in self.columns)
+        insert = f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new});"
+        delete = (
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old});"
+        )
+        return (
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT "
+            f"ON {self.table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE "
+            f"ON {self.table} BEGIN {delete} END",
+            # Срабатывает только при изменении индексируемых колонок.
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_update "
+            f"AFTER UPDATE OF {columns} "
+            f"ON {self.table} BEGIN {delete} {insert} END",
+        )
+
+    def sqlite_schema(self):
+        return (
+            f"CREATE VIRTUAL TABLE {self.fts_table} USING fts5("
+            f"{', '.join(self.columns)}, "
+            f"content='{self.table}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')",
+            *self.sqlite_trigger_schema(),
+        )
+
+    def sqlite_drop(self):
+        fts = self.fts_table
+        return (
+            f"DROP TRIGGER IF EXISTS {fts}_update",
+            f"DROP TRIGGER IF EXISTS {fts}_delete",
+            f"DROP TRIGGER IF EXISTS {fts}_insert",
+            f"DROP TABLE IF EXISTS {fts}",
+        )
+
+    def postgresql_schema(self):
+        return (
+            f"CREATE INDEX {self.pg_index} ON {self.table} "
+            f"USING GIN ({self.pg_document})",
+        )
+
+    def postgresql_drop(self):
+        return (f"DROP INDEX IF EXISTS {self.pg_index}",)
+
+
+POST_INDEX = SearchIndex("blog_post", ("title", "text"), weights=(10.0, 1.0))
+COMMENT_INDEX = SearchIndex("blog_comment", ("text",))
+INDEXES = (POST_INDEX, COMMENT_INDEX)
+
+
+def create_index(schema_editor, index=POST_INDEX):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements = index.sqlite_schema()
+    elif vendor == "postgresql":
+        statements = index.postgresql_schema()
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+    rebuild_index(schema_editor.connection, index)
+
+
+def drop_index(schema_editor, index=POST_INDEX):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements = index.sqlite_drop()
+    elif vendor == "postgresql":
+        statements = index.postgresql_drop()
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def rebuild_index(using=connection, index=POST_INDEX):
+    """Пересобирает поисковый индекс из текущего содержимого таблицы."""
+    with using.cursor() as cursor:
+        if using.vendor == "sqlite":
+            cursor.execute(
+                f"INSERT INTO {index.fts_table}({index.fts_table}) "
+                "VALUES ('rebuild')"
+            )
+        elif using.vendor == "postgresql":
+            cursor.execute(f"REINDEX INDEX {index.pg_index}")
+
+
+def restore_triggers(using=connection):
+    """Восстанавливает триггеры FTS5, потерянные при пересоздании таблицы.
+
+    SQLite выполняет многие AddField и AlterField пересозданием таблицы,
+    и её триггеры удаляются вместе со старой таблицей. Индекс, который
+    без триггеров мог отстать от таблицы, пересобирается.
+    """
+    if using.vendor != "sqlite":
+        return []
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type IN ('table', 'trigger')"
+        )
+        existing = {name for name, in cursor.fetchall()}
+    restored = []
+    for index in INDEXES:
+        # Пропускаем индексы, миграции которых ещё не применены.
+        if (index.fts_table not in existing
+                or set(index.sqlite_triggers) <= existing):
+            continue
+        with using.cursor() as cursor:
+            for statement in index.sqlite_trigger_schema():
+                cursor.execute(statement)
+        rebuild_index(using, index)
+        restored.append(index)
+    return restored
+
+
+def search_terms(query):
+    return re.findall(r"\w+", query)[:10]
+
+
+def fts_match(terms, column=None):
+    """Строит выражение MATCH, в котором каждое слово — строка FTS5.
+
+    Так пользовательский ввод не может задать операторы запроса;
+    последнее слово ищется как префикс.
+    """
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    expression = " ".join(quoted)
+    if column is not None:
+        return f"{column} : ({expression})"
+    return expression
+
+
+def pg_tsquery(terms):
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def matching_ids(index, terms, column=None):
+    """Подзапрос с id строк, подходящих под запрос, для фильтра id__in.
+
+    Возвращает None, если у базы данных нет полнотекстового индекса.
+    """
+    if connection.vendor == "sqlite":
+        return RawSQL(
+            f"SELECT rowid FROM {index.fts_table} "
+            f"WHERE {index.fts_table} MATCH %s",
+            (fts_match(terms, column),),
+        )
+    if connection.vendor == "postgresql":
+        document = index.pg_document
+        if column is not None:
+            document = SearchIndex(index.table, (column,)).pg_document
+        return RawSQL(
+            f"SELECT id FROM {index.table} WHERE {document} "
+            f"@@ to_tsquery('{PG_CONFIG}', %s)",
+            (pg_tsquery(terms),),
+        )
+    return None
+
+
+def _rank(index, terms):
+    return RawSQL(
+        f"ts_rank({index.pg_document}, to_tsquery('{PG_CONFIG}', %s))",
+        (pg_tsquery(terms),),
+        output_field=FloatField(),
+    )
+
+
+def _sqlite_ranked(queryset, index, terms):
+    # bm25() доступна только в запросе с MATCH. Соединение с таблицей
+    # FTS5 вычисляет её за один проход; коррелированный подзапрос
+    # выполнял бы MATCH заново для каждой найденной строки.
+    fts = index.fts_table
+    weights = ", ".join(str(weight) for weight in index.weights)
+    return queryset.filter(
+        search_document__isnull=False,
+    ).filter(
+        RawSQL(
+            f"{fts} MATCH %s", (fts_match(terms),), output_field=BooleanField()
+        )
+    ).annotate(
+        # bm25() отрицательна: чем меньше значение, тем выше релевантность.
+        rank=RawSQL(f"-bm25({fts}, {weights})", (), output_field=FloatField())
+    )
+
+
+def search_posts(queryset, query):
+    """Фильтрует публикации по запросу и сортирует их по релевантности."""
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == "sqlite":
+        ranked = _sqlite_ranked(queryset, POST_INDEX, terms)
+    elif connection.vendor == "postgresql":
+        ranked = queryset.filter(
+            id__in=matching_ids(POST_INDEX, terms)
+        ).annotate(rank=_rank(POST_INDEX, terms))
+    else:
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(text__icontains=term)
+        return queryset.filter(condition)
+    return ranked.order_by("-rank", "-pub_date")
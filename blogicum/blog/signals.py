@@ -0,0 +1,112 @@
+import math
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models.signals import (post_delete, post_migrate, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+from django.utils import timezone
+from jobs.queue import enqueue
+
+from . import feed, search
+from .cache import bump_feed_version, invalidate_profile_card
+from .lookups import invalidate_lookups
+from .thumbnails import available_formats, existing_formats
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_feed(sender, **kwargs):
+    bump_feed_version()
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_profile_card(sender, instance, **kwargs):
+    invalidate_profile_card(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_author_profile_card(sender, instance, **kwargs):
+    invalidate_profile_card(instance.author_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_category_and_location_lookups(sender, **kwargs):
+    invalidate_lookups()
+
+
+@receiver(post_save, sender=Post)
+def create_image_derivatives(sender, instance, **kwargs):
+    formats = existing_formats(instance.image.name) if instance.image else []
+    thumbnail_formats = " ".join(formats)
+    if instance.thumbnail_formats != thumbnail_formats:
+        instance.thumbnail_formats = thumbnail_formats
+        Post.objects.filter(pk=instance.pk).update(
+            thumbnail_formats=thumbnail_formats
+        )
+    if instance.image and len(formats) < len(available_formats()):
+        enqueue(
+            "blog.generate_thumbnails",
+            unique=True,
+            image_name=instance.image.name,
+        )
+
+
+@receiver(post_save, sender=Post)
+def schedule_publication(sender, instance, **kwargs):
+    if instance.is_published and not instance.is_visible:
+        delay = (instance.pub_date - timezone.now()).total_seconds()
+        enqueue(
+            "blog.publish_scheduled",
+            delay=max(math.ceil(delay), 0),
+            unique=True,
+            post_id=instance.pk,
+            pub_date=instance.pub_date.isoformat(),
+        )
+
+
+@receiver(post_save, sender=Post)
+def sync_feed_entry(sender, instance, **kwargs):
+    feed.sync_posts([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def sync_category_feed_entries(sender, instance, **kwargs):
+    feed.sync_category(instance)
+
+
+@receiver(post_save, sender=Location)
+def sync_location_feed_entries(sender, instance, **kwargs):
+    feed.sync_location(instance)
+
+
+@receiver(pre_delete, sender=Location)
+def clear_location_feed_entries(sender, instance, **kwargs):
+    instance.is_published = False
+    feed.sync_location(instance)
+
+
+@receiver(post_save, sender=User)
+def sync_author_feed_entries(sender, instance, **kwargs):
+    feed.sync_author(instance)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.name == "blog":
+        search.restore_triggers(connections[using])
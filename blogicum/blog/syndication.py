@@ -0,0 +1,90 @@
+"""RSS и Atom, которые отдаются по частям.
+
+Генераторы django.utils.feedgenerator собирают все элементы в список
+и пишут документ целиком; здесь тот же формат выводится поэлементно,
+поэтому длинная лента не держится в памяти ни как список объектов,
+ни как готовый документ.
+"""
+from io import StringIO
+
+from django.core.cache import cache
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.xmlutils import SimplerXMLGenerator
+
+ENCODING = "utf-8"
+
+
+class StreamingFeedMixin:
+    item_element = None
+    # Корневые элементы документа и методы, которые дают их атрибуты.
+    root_elements = ()
+
+    def make_item(self, **kwargs):
+        """Нормализует элемент так же, как add_item(), не сохраняя его."""
+        self.add_item(**kwargs)
+        return self.items.pop()
+
+    def latest_post_date(self):
+        # Элементы ещё не выбраны, когда пишется заголовок ленты,
+        # поэтому дата последнего изменения передаётся заранее.
+        return self.feed.get("updated") or super().latest_post_date()
+
+    def start(self, handler):
+        for name, attributes in self.root_elements:
+            handler.startElement(name, getattr(self, attributes)())
+
+    def end(self, handler):
+        for name, _ in reversed(self.root_elements):
+            handler.endElement(name)
+
+    def stream(self, items):
+        """Выдаёт документ частями: заголовок, затем по одному элементу."""
+        buffer = StringIO()
+        handler = SimplerXMLGenerator(
+            buffer, ENCODING, short_empty_elements=True
+        )
+
+        def flush():
+            chunk = buffer.getvalue().encode(ENCODING)
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        handler.startDocument()
+        self.start(handler)
+        self.add_root_elements(handler)
+        yield flush()
+        for item in items:
+            handler.startElement(self.item_element, self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_element)
+            yield flush()
+        self.end(handler)
+        yield flush()
+
+
+class RssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    item_element = "item"
+    root_elements = (
+        ("rss", "rss_attributes"), ("channel", "root_attributes")
+    )
+
+
+class AtomFeed(StreamingFeedMixin, Atom1Feed):
+    item_element = "entry"
+    root_elements = (("feed", "root_attributes"),)
+
+
+FEED_FORMATS = {"rss": RssFeed, "atom": AtomFeed}
+
+
+def cache_stream(chunks, key, timeout):
+    """Пропускает части ответа насквозь и кладёт в кэш весь документ.
+
+    Документ сохраняется, только если клиент дочитал его до конца.
+    """
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, b"".join(parts), timeout)
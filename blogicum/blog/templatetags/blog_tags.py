@@ -0,0 +1,19 @@
+from django import template
+from django.core.paginator import Paginator
+
+register = template.Library()
+
+
+@register.inclusion_tag("includes/page_links.html")
+def page_links(page_obj, page_query=""):
+    paginator = page_obj.paginator
+    if hasattr(paginator, "page_window"):
+        page_range = paginator.page_window(page_obj.number)
+    else:
+        page_range = paginator.get_elided_page_range(page_obj.number)
+    return {
+        "page_obj": page_obj,
+        "page_query": page_query,
+        "page_range": page_range,
+        "ellipsis": Paginator.ELLIPSIS,
+    }
@@ -0,0 +1,86 @@
+import logging
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, features
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = "thumbnails"
+
+FORMATS = {
+    "jpg": ("JPEG", {"quality": 85, "optimize": True}),
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+}
+
+
+def derivative_name(name, ext):
+    # Расширение оригинала остаётся в имени, чтобы a.jpg и a.png
+    # не делили одну миниатюру.
+    return posixpath.join(THUMBNAIL_DIR, f"{name}.{ext}")
+
+
+def available_formats():
+    return [
+        ext for ext in FORMATS if ext != "webp" or features.check("webp")
+    ]
+
+
+def derivative_url(name, ext):
+    return default_storage.url(derivative_name(name, ext))
+
+
+def existing_formats(name):
+    return [
+        ext for ext in available_formats()
+        if default_storage.exists(derivative_name(name, ext))
+    ]
+
+
+def has_derivatives(name):
+    return len(existing_formats(name)) == len(available_formats())
+
+
+def mark_derivatives(name):
+    """Записывает в публикации с изображением, какие миниатюры готовы.
+
+    Страницы строят адреса миниатюр по этому полю и не обращаются
+    к хранилищу. Возвращает число изменённых публикаций.
+    """
+    from .models import Post
+
+    formats = " ".join(existing_formats(name))
+    return (
+        Post.objects.filter(image=name)
+        .exclude(thumbnail_formats=formats)
+        .update(thumbnail_formats=formats)
+    )
+
+
+def generate_derivatives(name, force=False):
+    """Создаёт уменьшенные копии изображения рядом с оригиналом."""
+    if not force and has_derivatives(name):
+        return []
+    try:
+        with default_storage.open(name) as source:
+            image = Image.open(source)
+            image.thumbnail(settings.THUMBNAIL_SIZE)
+            image = image.convert("RGB")
+    except (OSError, Image.DecompressionBombError):
+        logger.exception("Не удалось прочитать изображение %s", name)
+        return []
+
+    created = []
+    for ext in available_formats():
+        image_format, options = FORMATS[ext]
+        buffer = BytesIO()
+        image.save(buffer, format=image_format, **options)
+        derivative = derivative_name(name, ext)
+        default_storage.delete(derivative)
+        created.append(
+            default_storage.save(derivative, ContentFile(buffer.getvalue()))
+        )
+    return created
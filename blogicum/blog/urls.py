@@ -15,6 +15,22 @@ urlpatterns = [
         views.PostDetailView.as_view(),
         name="post_detail"
     ),
+    path(
+        "feeds/<str:feed_format>/",
+        views.SyndicationFeedView.as_view(),
+        name="feed",
+    ),
+    path(
+        "category/<slug:category_slug>/feeds/<str:feed_format>/",
+        views.CategoryFeedView.as_view(),
+        name="category_feed",
+    ),
+    path(
+        "profile/<slug:username>/feeds/<str:feed_format>/",
+        views.ProfileFeedView.as_view(),
+        name="profile_feed",
+    ),
+    path("search/", views.SearchView.as_view(), name="search"),
     path("posts/create/", views.PostCreateView.as_view(), name="create_post"),
     path(
         "posts/<int:post_id>/edit/",
@@ -1,6 +1,14 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.views import View
 from django.views.generic import (
     CreateView,
     ListView,
@@ -8,73 +16,173 @@ from django.views.generic import (
     DetailView,
     DeleteView,
 )
+from .cache import feed_cache_timeout, feed_page_key, get_profile_card
 from .form import CommentForm, PostForm, ProfileEditForm
-from .models import Category, Comment, Post
-from blogicum.settings import POST_IN_PAGE
+from .lookups import get_published_category
+from .models import Category, Comment, Location, Post
+from .paginators import CursorPaginator, WindowedPaginator
+from .search import search_posts
+from .syndication import FEED_FORMATS, cache_stream
+from blogicum.settings import (COMMENTS_IN_PAGE, POST_IN_PAGE,
+                               SYNDICATION_ITEMS)
 from .mixins import (AuthorTestMixin, UrlSuccesProfileMixin,
-                     UrlSuccesPostMixin, CommentUpdateMixin, UserTestMixin)
+                     UrlSuccesPostMixin, CommentUpdateMixin, UserTestMixin,
+                     ConditionalGetMixin, CursorPaginationMixin,
+                     FeedCacheMixin, FeedTableMixin, ObjectCacheMixin,
+                     PostLookupsMixin, latest_change)
 
 
 User = get_user_model()
 
 
-class IndexListView(ListView):
+class IndexListView(ConditionalGetMixin, FeedCacheMixin,
+                    CursorPaginationMixin, FeedTableMixin, ListView):
     model = Post
     paginate_by = POST_IN_PAGE
+    paginator_class = WindowedPaginator
     template_name = 'blog/index.html'
 
-    def get_queryset(self):
+    def get_last_modified(self):
+        return latest_change(
+            (Post.objects.all(), 'updated_at'),
+            (Comment.objects.all(), 'updated_at'),
+            (Category.objects.all(), 'updated_at'),
+            (Location.objects.all(), 'updated_at'),
+        )
+
+    def get_post_queryset(self):
         return (
             Post.objects
             .published()
-            .annotate_comments()
+            .select_related('author')
+            .defer('text')
         )
 
 
-class CategoryListView(ListView):
+class CategoryListView(ConditionalGetMixin, FeedCacheMixin,
+                       CursorPaginationMixin, FeedTableMixin, ListView):
     model = Post
     paginate_by = POST_IN_PAGE
+    paginator_class = WindowedPaginator
     template_name = 'blog/category.html'
 
-    def get_queryset(self):
-        category = get_object_or_404(
-            Category, slug=self.kwargs['category_slug'], is_published=True
+    def get_category(self):
+        if not hasattr(self, 'category'):
+            self.category = get_published_category(
+                self.kwargs['category_slug']
+            )
+            if self.category is None:
+                raise Http404('Категория не найдена')
+        return self.category
+
+    def get_feed_queryset(self):
+        return super().get_feed_queryset().filter(
+            category_id=self.get_category().pk
         )
 
+    def get_last_modified(self):
+        # Последние изменения по всему сайту берутся из индексов
+        # по updated_at; более позднее время безопасно для Last-Modified.
+        # Название и описание категории выводятся на странице.
+        site_change = latest_change(
+            (Post.objects.all(), 'updated_at'),
+            (Comment.objects.all(), 'updated_at'),
+            (Location.objects.all(), 'updated_at'),
+        )
+        category_change = self.get_category().updated_at
+        return max(site_change or category_change, category_change)
+
+    def get_post_queryset(self):
         return (
-            category.posts.post_select_related()
+            Post.objects
+            .published()
+            .filter(category_id=self.get_category().pk)
+            .select_related('author')
+            .defer('text')
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['category'] = self.get_category()
+        return context
+
+
+class SearchView(PostLookupsMixin, ListView):
+    model = Post
+    paginate_by = POST_IN_PAGE
+    paginator_class = WindowedPaginator
+    template_name = 'blog/search.html'
+    query_kwarg = 'q'
+
+    def get_query(self):
+        return self.request.GET.get(self.query_kwarg, '').strip()
+
+    def get_queryset(self):
+        return search_posts(
+            Post.objects
             .published()
-            .annotate_comments()
+            .select_related('author')
+            .defer('text'),
+            self.get_query(),
         )
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.get_query()
+        context['query'] = query
+        if query:
+            context['page_query'] = urlencode({self.query_kwarg: query}) + '&'
+        return context
+
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, ObjectCacheMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
+    comments_cursor_kwarg = 'comments'
 
-    def get_object(self, queryset=None):
-        self.author = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        if self.request.user == self.author.author:
-            return self.author
+    pk_url_kwarg = 'post_id'
 
-        return get_object_or_404(
-            Post.objects.published(),
-            pk=self.kwargs['post_id']
+    def get_queryset(self):
+        last_comment = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by('-updated_at')
+            .values('updated_at')[:1]
+        )
+        return Post.objects.visible_to(self.request.user).annotate(
+            last_comment_at=Subquery(last_comment)
         )
 
+    def get_last_modified(self):
+        post = self.get_object()
+        return max(filter(None, (post.updated_at, post.last_comment_at)))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        paginator = CursorPaginator(
+            self.object.comments.select_related('author'),
+            COMMENTS_IN_PAGE,
+            key_field='created_at',
+            descending=False,
+        )
+        try:
+            context['comments'] = paginator.page(
+                self.request.GET.get(self.comments_cursor_kwarg)
+            )
+        except InvalidPage as error:
+            raise Http404(str(error))
         return context
 
 
-class PostDeleteView(LoginRequiredMixin, AuthorTestMixin,
+class PostDeleteView(LoginRequiredMixin, ObjectCacheMixin, AuthorTestMixin,
                      UrlSuccesProfileMixin, DeleteView):
     model = Post
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        return Post.objects.select_related('location')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = PostForm(instance=self.object)
@@ -91,7 +199,7 @@ class PostCreateView(LoginRequiredMixin, UrlSuccesProfileMixin, CreateView):
         return super().form_valid(form)
 
 
-class PostUpdateView(LoginRequiredMixin, AuthorTestMixin,
+class PostUpdateView(LoginRequiredMixin, ObjectCacheMixin, AuthorTestMixin,
                      UrlSuccesPostMixin, UpdateView):
     model = Post
     template_name = 'blog/create.html'
@@ -99,25 +207,39 @@ class PostUpdateView(LoginRequiredMixin, AuthorTestMixin,
     pk_url_kwarg = 'post_id'
 
 
-class ProfileListView(ListView):
+class ProfileListView(ConditionalGetMixin, CursorPaginationMixin,
+                      PostLookupsMixin, ListView):
     model = Post
     paginate_by = POST_IN_PAGE
+    paginator_class = WindowedPaginator
     template_name = 'blog/profile.html'
 
+    def get_profile(self):
+        if not hasattr(self, 'profile'):
+            self.profile = get_object_or_404(
+                User, username=self.kwargs['username']
+            )
+        return self.profile
+
     def get_queryset(self):
-        user = get_object_or_404(User, username=self.kwargs['username'])
         return (
             self.model.objects.select_related('author')
-            .filter(author__id=user.id)
-            .annotate_comments()
+            .defer('text')
+            .filter(author=self.get_profile())
         )
 
+    def get_etag_parts(self):
+        # Правка профиля не меняет версию ленты, а карточка — меняется.
+        card = get_profile_card(self.get_profile())
+        return [*super().get_etag_parts(), sorted(card.items())]
+
+    # Last-Modified не отдаётся: у пользователя нет времени изменения,
+    # а правка профиля меняет страницу, не трогая публикаций.
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = get_object_or_404(
-            User,
-            username=self.kwargs['username']
-        )
+        context['profile'] = self.get_profile()
+        context['profile_card'] = get_profile_card(self.get_profile())
         return context
 
 
@@ -139,15 +261,156 @@ class CommentCreateView(LoginRequiredMixin, UrlSuccesPostMixin, CreateView):
     def form_valid(self, form):
         form.instance.post = get_object_or_404(Post, pk=self.kwargs['post_id'])
         form.instance.author = self.request.user
-        form.save()
+        with transaction.atomic():
+            form.save()
+            Post.objects.filter(
+                pk=form.instance.post_id
+            ).change_comment_count(1)
         return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
 
 
-class CommentUpdateView(LoginRequiredMixin, AuthorTestMixin,
-                        UrlSuccesPostMixin, CommentUpdateMixin, UpdateView):
+class CommentUpdateView(LoginRequiredMixin, ObjectCacheMixin,
+                        AuthorTestMixin, UrlSuccesPostMixin,
+                        CommentUpdateMixin, UpdateView):
     pass
 
 
-class CommentDeleteView(LoginRequiredMixin, AuthorTestMixin,
-                        UrlSuccesPostMixin, CommentUpdateMixin, DeleteView):
-    pass
+class CommentDeleteView(LoginRequiredMixin, ObjectCacheMixin,
+                        AuthorTestMixin, UrlSuccesPostMixin,
+                        CommentUpdateMixin, DeleteView):
+    def delete(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().delete(request, *args, **kwargs)
+            Post.objects.filter(
+                pk=self.object.post_id
+            ).change_comment_count(-1)
+        return response
+
+
+class FeedView(View):
+    """Отдаёт ленту RSS или Atom потоком и кэширует её по версии ленты.
+
+    Публикации читаются через iterator(), а документ пишется
+    поэлементно; целиком он собирается только для записи в кэш.
+    """
+
+    last_modified = None
+
+    def get_feed_class(self):
+        feed_class = FEED_FORMATS.get(self.kwargs['feed_format'])
+        if feed_class is None:
+            raise Http404('Неизвестный формат ленты')
+        return feed_class
+
+    def get(self, request, *args, **kwargs):
+        feed_class = self.get_feed_class()
+        key = feed_page_key(
+            request.get_full_path(), getattr(self, 'feed_version', None)
+        )
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content, content_type=feed_class.content_type)
+
+        feed = feed_class(
+            title=self.get_title(),
+            link=request.build_absolute_uri(self.get_link()),
+            description=self.description,
+            language='ru',
+            feed_url=request.build_absolute_uri(),
+            updated=self.last_modified,
+        )
+        posts = (
+            self.get_queryset()
+            .select_related('author', 'category')
+            .order_by('-pub_date', '-pk')[:self.items]
+        )
+        items = (
+            feed.make_item(**self.item_kwargs(post))
+            for post in posts.iterator()
+        )
+        return StreamingHttpResponse(
+            cache_stream(feed.stream(items), key, feed_cache_timeout()),
+            content_type=feed_class.content_type,
+        )
+
+
+class SyndicationFeedView(ConditionalGetMixin, FeedView):
+    """Последние опубликованные посты сайта."""
+
+    title = 'Блогикум'
+    description = 'Новые публикации'
+    items = SYNDICATION_ITEMS
+
+    def get_queryset(self):
+        return Post.objects.published()
+
+    def get_link(self):
+        return reverse('blog:index')
+
+    def get_title(self):
+        return self.title
+
+    def get_etag_parts(self):
+        # Лента одна для всех пользователей.
+        return [self.feed_version, self.request.get_full_path()]
+
+    def get_last_modified(self):
+        return latest_change(
+            (Post.objects.all(), 'updated_at'),
+            (Category.objects.all(), 'updated_at'),
+        )
+
+    def item_kwargs(self, post):
+        link = self.request.build_absolute_uri(
+            reverse('blog:post_detail', args=(post.pk,))
+        )
+        return {
+            'title': post.title,
+            'link': link,
+            'unique_id': link,
+            'description': post.text,
+            'author_name': post.author.username,
+            'pubdate': post.pub_date,
+            'updateddate': post.updated_at,
+            'categories': (post.category.title,),
+        }
+
+
+class CategoryFeedView(SyndicationFeedView):
+    def get_category(self):
+        if not hasattr(self, 'category'):
+            self.category = get_published_category(
+                self.kwargs['category_slug']
+            )
+            if self.category is None:
+                raise Http404('Категория не найдена')
+        return self.category
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            category_id=self.get_category().pk
+        )
+
+    def get_link(self):
+        return reverse('blog:category_posts', args=(self.get_category().slug,))
+
+    def get_title(self):
+        return f'{self.title}: {self.get_category().title}'
+
+
+class ProfileFeedView(SyndicationFeedView):
+    def get_profile(self):
+        if not hasattr(self, 'profile'):
+            self.profile = get_object_or_404(
+                User, username=self.kwargs['username']
+            )
+        return self.profile
+
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.get_profile())
+
+    def get_link(self):
+        return reverse('blog:profile', args=(self.get_profile().username,))
+
+    def get_title(self):
+        return f'{self.title}: {self.get_profile().username}'
@@ -34,6 +34,8 @@ INSTALLED_APPS = [
     "django_bootstrap5",
     "blog.apps.BlogConfig",
     "pages.apps.PagesConfig",
+    "jobs.apps.JobsConfig",
+    "api.apps.ApiConfig",
 ]
 
 
@@ -82,6 +84,19 @@ DATABASES = {
 }
 
 
+# Версии кэша лент, справочников и расписания публикаций меняют
+# и веб-процессы, и run_jobs, publish_scheduled, blog_import, seed_blog,
+# поэтому кэш должен быть общим для всех процессов: DatabaseCache
+# (таблицу создаёт миграция blog 0018), Memcached или Redis.
+# Кэш в памяти процесса (LocMemCache) отклоняется проверкой blog.E001.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "blog_cache",
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -144,4 +159,40 @@ EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
 
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Рамка, в которую вписываются миниатюры изображений публикаций.
+THUMBNAIL_SIZE = (640, 640)
+
+# Выполнять фоновые задачи сразу в запросе, без обработчика run_jobs.
+JOBS_EAGER = False
+
+# Через сколько секунд незавершённая задача снова становится доступной.
+JOBS_VISIBILITY_TIMEOUT = 5 * 60
+
+# Базовая пауза перед повтором упавшей задачи; удваивается с каждой попыткой.
+JOBS_RETRY_DELAY = 30
+
 POST_IN_PAGE = 10
+
+COMMENTS_IN_PAGE = 50
+
+# Курсорная пагинация лент вместо OFFSET и COUNT(*).
+CURSOR_PAGINATION = False
+
+# Читать ленты из денормализованной таблицы FeedEntry
+# (после включения заполните её командой rebuild_feed).
+FEED_TABLE = False
+
+# Максимальное время жизни закэшированной страницы ленты, в секундах.
+FEED_CACHE_TIMEOUT = 60 * 15
+
+# Сколько последних публикаций отдавать в RSS и Atom.
+SYNDICATION_ITEMS = 50
+
+# Время жизни карточки пользователя на странице профиля, в секундах.
+PROFILE_CARD_TIMEOUT = 60 * 60
+
+# До какого размера таблицы админка считает записи точно через COUNT(*).
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
+# Сколько категорий и местоположений держать в памяти процесса.
+LOOKUP_CACHE_SIZE = 1000
@@ -9,6 +9,7 @@ from django.conf.urls.static import static
 urlpatterns = [
     path("", include("blog.urls", namespace="blog")),
     path("pages/", include("pages.urls", namespace="about")),
+    path("api/", include("api.urls", namespace="api")),
     path("admin/", admin.site.urls),
     path("auth/", include("django.contrib.auth.urls")),
     path(
@@ -0,0 +1,26 @@
+"""Пакетная вставка строк с получением их id."""
+from django.db.models import Max
+
+
+def bulk_insert(model, objs):
+    """Вставляет строки через bulk_create() и проставляет им id.
+
+    bulk_create() в SQLite не возвращает id, поэтому новые строки
+    находятся как строки с id больше прежнего максимума. Вызывать нужно
+    внутри транзакции, чтобы между вставкой и выборкой id не попали
+    строки из других соединений.
+    """
+    objs = list(objs)
+    if not objs:
+        return objs
+    last_pk = model.objects.aggregate(last=Max("pk"))["last"] or 0
+    model.objects.bulk_create(objs)
+    if objs[0].pk is None:
+        pks = (
+            model.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        for obj, pk in zip(objs, pks):
+            obj.pk = pk
+    return objs
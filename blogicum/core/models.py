@@ -1,4 +1,13 @@
 from django.db import models
+from django.db.models.functions import Now
+
+
+class PublishedQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # UPDATE через QuerySet обходит auto_now, поэтому время
+        # изменения проставляется здесь.
+        kwargs.setdefault("updated_at", Now())
+        return super().update(**kwargs)
 
 
 class PublishedModel(models.Model):
@@ -16,7 +25,20 @@ class PublishedModel(models.Model):
         help_text="Идентификатор страницы для URL; "
         "разрешены символы латиницы, цифры, дефис и подчёркивание.",
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name="Изменено",
+    )
+
+    objects = PublishedQuerySet.as_manager()
 
     class Meta:
         abstract = True
         ordering = ('created_at', )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
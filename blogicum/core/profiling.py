@@ -0,0 +1,172 @@
+"""Замеры SQL-запросов и отрисовки шаблонов для тестов и бенчмарков.
+
+profile() записывает каждый запрос с его длительностью через
+execute_wrapper(), поэтому работает и при DEBUG = False, а время
+отрисовки считает по шаблонам верхнего уровня. Запросы к таблицам
+DatabaseCache учитываются отдельно от запросов страницы. Budget
+описывает допустимые значения для страницы.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.template.backends.django import Template
+
+
+class QueryRecord(NamedTuple):
+    sql: str
+    params: tuple
+    duration: float
+
+
+# Точки сохранения в тестах появляются только потому, что тест идёт
+# внутри транзакции; вне её transaction.atomic() открывает и фиксирует
+# транзакцию без отдельных запросов через курсор.
+SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT",
+                        "ROLLBACK TO SAVEPOINT")
+
+
+def cache_tables():
+    return [
+        options["LOCATION"]
+        for options in settings.CACHES.values()
+        if options["BACKEND"].endswith("DatabaseCache")
+    ]
+
+
+class Profile:
+    def __init__(self):
+        self.queries = []
+        self.cache_queries = []
+        self.render_time = 0.0
+
+    @property
+    def sql_count(self):
+        return len(self.queries)
+
+    @property
+    def cache_count(self):
+        return len(self.cache_queries)
+
+    @property
+    def sql_time(self):
+        return sum(query.duration for query in self.queries)
+
+    @property
+    def cache_time(self):
+        return sum(query.duration for query in self.cache_queries)
+
+    def duplicates(self):
+        """Запросы, выполненные больше одного раза с любыми параметрами.
+
+        Обычно это признак N+1: один и тот же запрос в цикле шаблона.
+        """
+        counts = Counter(query.sql for query in self.queries)
+        return [(sql, count) for sql, count in counts.most_common()
+                if count > 1]
+
+    def report(self):
+        lines = [
+            f"Запросов: {self.sql_count}, SQL: {self.sql_time:.2f} мс, "
+            f"к кэшу: {self.cache_count} ({self.cache_time:.2f} мс), "
+            f"шаблоны: {self.render_time:.2f} мс"
+        ]
+        lines += [
+            f"{number}. [{query.duration:.2f} мс] {query.sql} "
+            f"{query.params!r}"
+            for number, query in enumerate(self.queries, 1)
+        ]
+        if self.cache_queries:
+            lines.append("Запросы к кэшу:")
+            lines += [
+                f"{number}. [{query.duration:.2f} мс] {query.sql}"
+                for number, query in enumerate(self.cache_queries, 1)
+            ]
+        duplicates = self.duplicates()
+        if duplicates:
+            lines.append("Повторяющиеся запросы:")
+            lines += [f"×{count} {sql}" for sql, count in duplicates]
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile(using=DEFAULT_DB_ALIAS):
+    """Собирает Profile для кода внутри блока with.
+
+    Время отрисовки включает запросы, выполненные из шаблона.
+    """
+    result = Profile()
+    quote_name = connections[using].ops.quote_name
+    cache_names = [quote_name(table) for table in cache_tables()]
+
+    def record_query(execute, sql, params, many, context):
+        if sql.startswith(SAVEPOINT_STATEMENTS):
+            return execute(sql, params, many, context)
+        queries = result.queries
+        if any(name in sql for name in cache_names):
+            queries = result.cache_queries
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            queries.append(QueryRecord(
+                sql,
+                tuple(params) if params is not None and not many else (),
+                (time.perf_counter() - started) * 1000,
+            ))
+
+    original_render = Template.render
+    depth = 0
+
+    def render(template, context=None, request=None):
+        nonlocal depth
+        depth += 1
+        started = time.perf_counter()
+        try:
+            return original_render(template, context, request)
+        finally:
+            depth -= 1
+            # Вложенные render_to_string() уже учтены во внешнем шаблоне.
+            if not depth:
+                result.render_time += (time.perf_counter() - started) * 1000
+
+    Template.render = render
+    try:
+        with connections[using].execute_wrapper(record_query):
+            yield result
+    finally:
+        Template.render = original_render
+
+
+class Budget(NamedTuple):
+    """Предельные значения для одной страницы; None — без ограничения."""
+
+    queries: int
+    sql_time: Optional[float] = None
+    render_time: Optional[float] = None
+    cache_queries: Optional[int] = None
+
+    def violations(self, result):
+        checks = (
+            ("запросов", result.sql_count, self.queries),
+            ("запросов к кэшу", result.cache_count, self.cache_queries),
+            ("мс SQL", result.sql_time, self.sql_time),
+            ("мс отрисовки", result.render_time, self.render_time),
+        )
+        return [
+            f"{value:g} {name} при бюджете {limit:g}"
+            for name, value, limit in checks
+            if limit is not None and value > limit
+        ]
+
+    def check(self, result, name=""):
+        """Бросает AssertionError со списком запросов при превышении."""
+        violations = self.violations(result)
+        if violations:
+            raise AssertionError(
+                f"Превышен бюджет {name}: {'; '.join(violations)}\n"
+                f"{result.report()}"
+            )
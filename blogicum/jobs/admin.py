@@ -0,0 +1,22 @@
+from django.contrib import admin  # type: ignore
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "status",
+        "attempts",
+        "run_after",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "name")
+    search_fields = ("name",)
+    readonly_fields = (
+        "last_error", "locked_until", "locked_by", "finished_at"
+    )
+
+
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,68 @@
+import multiprocessing
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.queue import work
+
+
+def run_worker(**options):
+    django.setup()
+    work(**options)
+
+
+class Command(BaseCommand):
+    help = "Запускает обработчики фоновых задач из очереди в базе данных."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Число процессов-обработчиков.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Завершиться, когда очередь опустеет.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Пауза между опросами пустой очереди, в секундах.",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=int,
+            default=None,
+            help="Через сколько секунд незавершённую задачу возьмёт "
+            "другой обработчик.",
+        )
+
+    def handle(self, *args, **options):
+        work_options = {
+            "burst": options["burst"],
+            "poll_interval": options["poll_interval"],
+            "visibility_timeout": options["visibility_timeout"],
+        }
+        if options["processes"] <= 1:
+            processed = work(**work_options)
+            self.stdout.write(f"Выполнено задач: {processed}")
+            return
+
+        # Дочерние процессы не должны делить соединения с родителем.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=run_worker, kwargs=work_options)
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
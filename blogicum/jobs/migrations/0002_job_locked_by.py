@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-18 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="locked_by",
+            field=models.CharField(
+                blank=True,
+                help_text="Метка захвата задачи; завершить задачу может "
+                "только обработчик с этой меткой.",
+                max_length=32,
+                verbose_name="Обработчик",
+            ),
+        ),
+    ]
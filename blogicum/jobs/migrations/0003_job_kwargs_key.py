@@ -0,0 +1,42 @@
+# Generated by Django 3.2.16 on 2026-10-18 09:40
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def fill_kwargs_key(apps, schema_editor):
+    # Копия jobs.models.make_kwargs_key на момент миграции.
+    Job = apps.get_model("jobs", "Job")
+    for job in Job.objects.filter(status="pending").iterator():
+        data = json.dumps(job.kwargs, sort_keys=True, separators=(",", ":"))
+        job.kwargs_key = hashlib.md5(data.encode()).hexdigest()
+        job.save(update_fields=["kwargs_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0002_job_locked_by"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="kwargs_key",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=32,
+                verbose_name="Ключ аргументов",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["name", "kwargs_key"], name="job_name_kwargs_idx"
+            ),
+        ),
+        migrations.RunPython(fill_kwargs_key, migrations.RunPython.noop),
+    ]
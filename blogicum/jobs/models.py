@@ -0,0 +1,89 @@
+import hashlib
+import json
+
+from django.db import models
+from django.utils import timezone
+
+MAX_LENGTH = 256
+
+
+def make_kwargs_key(kwargs):
+    """Ключ аргументов задачи, не зависящий от порядка имён.
+
+    Сравнение JSONField в SQLite учитывает порядок ключей, поэтому
+    одинаковые аргументы сравниваются по этому ключу.
+    """
+    data = json.dumps(kwargs, sort_keys=True, separators=(",", ":"))
+    return hashlib.md5(data.encode()).hexdigest()
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "В очереди"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Выполнена"
+        FAILED = "failed", "Ошибка"
+
+    name = models.CharField(max_length=MAX_LENGTH, verbose_name="Задача")
+    kwargs = models.JSONField(default=dict, verbose_name="Аргументы")
+    kwargs_key = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        verbose_name="Ключ аргументов",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Попыток")
+    max_attempts = models.PositiveIntegerField(
+        default=3, verbose_name="Максимум попыток"
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now, verbose_name="Не раньше"
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Занята до",
+        help_text="Если обработчик не завершит задачу к этому времени, "
+        "её возьмёт другой обработчик.",
+    )
+    locked_by = models.CharField(
+        max_length=32,
+        blank=True,
+        verbose_name="Обработчик",
+        help_text="Метка захвата задачи; завершить задачу может только "
+        "обработчик с этой меткой.",
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Добавлена"
+    )
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Завершена"
+    )
+
+    class Meta:
+        ordering = ("run_after",)
+        verbose_name = "задача"
+        verbose_name_plural = "Задачи"
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(
+                fields=["name", "kwargs_key"], name="job_name_kwargs_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+    def save(self, *args, **kwargs):
+        self.kwargs_key = make_kwargs_key(self.kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "kwargs" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "kwargs_key"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,160 @@
+import logging
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job, make_kwargs_key
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def register(func=None, *, name=None):
+    """Регистрирует функцию как фоновую задачу.
+
+    Аргументы задачи хранятся в JSON, поэтому передаются только
+    именованные аргументы простых типов.
+    """
+
+    def decorator(func):
+        registry[name or f"{func.__module__}.{func.__name__}"] = func
+        return func
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+def enqueue(job_name, max_attempts=3, delay=0, unique=False, **kwargs):
+    """Ставит задачу в очередь.
+
+    С unique=True задача не дублируется, если такая же задача с теми же
+    аргументами уже ждёт в очереди.
+    """
+    if settings.JOBS_EAGER:
+        registry[job_name](**kwargs)
+        return None
+    if unique:
+        pending = Job.objects.filter(
+            name=job_name,
+            kwargs_key=make_kwargs_key(kwargs),
+            status=Job.Status.PENDING,
+        ).first()
+        if pending is not None:
+            return pending
+    return Job.objects.create(
+        name=job_name,
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def _available(now):
+    return Q(
+        Q(status=Job.Status.PENDING, run_after__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_until__lt=now),
+        attempts__lt=F("max_attempts"),
+    )
+
+
+def fail_abandoned():
+    """Помечает ошибочными задачи, исчерпавшие попытки из-за тайм-аута."""
+    return Job.objects.filter(
+        status=Job.Status.RUNNING,
+        locked_until__lt=timezone.now(),
+        attempts__gte=F("max_attempts"),
+    ).update(
+        status=Job.Status.FAILED,
+        last_error="Истёк тайм-аут видимости задачи.",
+        finished_at=timezone.now(),
+    )
+
+
+def claim(visibility_timeout=None, candidates=10):
+    """Атомарно забирает задачу из очереди.
+
+    Задача помечается выполняемой условным UPDATE, поэтому несколько
+    обработчиков могут работать с одной базой, в том числе с SQLite.
+    """
+    if visibility_timeout is None:
+        visibility_timeout = settings.JOBS_VISIBILITY_TIMEOUT
+    now = timezone.now()
+    pks = list(
+        Job.objects.filter(_available(now))
+        .order_by("run_after", "pk")
+        .values_list("pk", flat=True)[:candidates]
+    )
+    for pk in pks:
+        claimed = Job.objects.filter(_available(now), pk=pk).update(
+            status=Job.Status.RUNNING,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            locked_by=uuid.uuid4().hex,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run(job):
+    """Выполняет захваченную задачу и записывает результат.
+
+    Результат записывается, только если задачу не перехватил другой
+    обработчик после истечения тайм-аута видимости; иначе задача
+    остаётся за ним.
+    """
+    try:
+        registry[job.name](**job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        logger.exception("Задача %s (%s) завершилась ошибкой", job.pk, job)
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+        else:
+            job.status = Job.Status.PENDING
+            job.run_after = timezone.now() + timedelta(
+                seconds=settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+    else:
+        job.status = Job.Status.DONE
+        job.finished_at = timezone.now()
+    job.locked_until = None
+    completed = Job.objects.filter(
+        pk=job.pk, locked_by=job.locked_by, attempts=job.attempts
+    ).update(
+        status=job.status,
+        run_after=job.run_after,
+        locked_until=None,
+        last_error=job.last_error,
+        finished_at=job.finished_at,
+    )
+    if not completed:
+        logger.warning(
+            "Задача %s перехвачена другим обработчиком; "
+            "результат не записан", job.pk
+        )
+        job.refresh_from_db()
+    return job
+
+
+def work(burst=False, poll_interval=1.0, visibility_timeout=None):
+    """Цикл обработчика. В режиме burst завершается на пустой очереди."""
+    processed = 0
+    while True:
+        fail_abandoned()
+        job = claim(visibility_timeout)
+        if job is None:
+            if burst:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        run(job)
+        processed += 1
@@ -0,0 +1,104 @@
+import re
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+from blog.paginators import EstimatedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def admin_client(client: Client):
+    admin = get_user_model().objects.create_superuser(
+        username="admin", password=None
+    )
+    client.force_login(admin)
+    return client
+
+
+@pytest.mark.parametrize("url", ["/admin/blog/post/", "/admin/blog/comment/"])
+def test_changelist_queries_do_not_grow(
+        admin_client: Client, mixer: Mixer, url: str,
+        django_assert_max_num_queries,
+):
+    def changelist_queries():
+        with django_assert_max_num_queries(100) as captured:
+            assert admin_client.get(url).status_code == 200
+        return len(captured)
+
+    mixer.blend("blog.Comment")
+    baseline = changelist_queries()
+    mixer.cycle(5).blend("blog.Comment")
+    assert changelist_queries() == baseline, (
+        "Убедитесь, что список в админке загружает связанные объекты"
+        " одним запросом."
+    )
+
+
+def test_estimated_count_paginator(
+        settings, mixer: Mixer, django_assert_num_queries
+):
+    mixer.cycle(3).blend("blog.Post")
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    settings.ADMIN_EXACT_COUNT_LIMIT = 0
+    paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+    with django_assert_num_queries(1) as captured:
+        assert paginator.count == 3
+    assert "COUNT" not in captured[0]["sql"]
+
+    filtered = EstimatedCountPaginator(Post.objects.filter(title="-"), 10)
+    assert filtered.count == 0
+
+
+def test_comment_search_uses_indexes(
+        admin_client: Client, mixer: Mixer, post_with_published_location,
+):
+    post = post_with_published_location
+    post.title = "Закат над заливом"
+    post.save()
+    author = mixer.blend(get_user_model(), username="moderator_kate")
+    by_text = mixer.blend("blog.Comment", text="Отличная фотография")
+    by_author = mixer.blend("blog.Comment", author=author, text="-")
+    by_post = mixer.blend("blog.Comment", post=post, text="-")
+    mixer.blend("blog.Comment", text="Ничего общего")
+
+    def found(term):
+        response = admin_client.get("/admin/blog/comment/", {"q": term})
+        assert response.status_code == 200
+        return set(response.context["cl"].result_list)
+
+    assert found("фотограф") == {by_text}
+    assert found("moderator_k") == {by_author}
+    assert found("закат") == {by_post}
+    assert found('"(') == set()
+
+
+def test_comment_search_plan_avoids_full_scan(rf):
+    queryset, _ = admin.site._registry[Comment].get_search_results(
+        rf.get("/"), Comment.objects.all(), "текст"
+    )
+    plan = queryset.explain()
+    assert not re.search(r"SCAN blog_comment$", plan, re.MULTILINE), plan
+
+
+def test_post_changelist_edits_relations_with_autocomplete(
+        admin_client: Client, post_with_published_location,
+):
+    post = post_with_published_location
+    content = admin_client.get("/admin/blog/post/").content.decode("utf-8")
+    for name, related in (("category", post.category),
+                          ("location", post.location)):
+        assert re.search(
+            rf'<select name="form-0-{name}"[^>]*admin-autocomplete', content
+        ), f"Убедитесь, что поле {name} редактируется в списке публикаций."
+        assert (
+            f'<option value="{related.pk}" selected>{related}</option>'
+            in content
+        )
@@ -0,0 +1,81 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def api_posts(mixer: Mixer, user: Model, published_category: Model):
+    return mixer.cycle(15).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+    )
+
+
+def test_post_list_cursor_pagination(client: Client, api_posts: list):
+    seen = []
+    url = "/api/posts/"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        seen += [item["id"] for item in data["results"]]
+        url = data["next"]
+    expected = sorted(api_posts, key=lambda post: (post.pub_date, post.id))
+    assert seen == [post.id for post in reversed(expected)], (
+        "Убедитесь, что API отдаёт все публикации ленты по курсору."
+    )
+
+
+def test_sparse_fields_select_only_needed_columns(
+        client: Client, api_posts: list
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/posts/", {"fields": "id,title,author"})
+    assert set(response.json()["results"][0]) == {"id", "title", "author"}
+    page_query = next(
+        query["sql"] for query in queries.captured_queries
+        if "LIMIT" in query["sql"]
+    )
+    assert '"blog_post"."text"' not in page_query
+    assert '"blog_post"."excerpt"' not in page_query
+
+    response = client.get("/api/posts/", {"fields": "id,password"})
+    assert response.status_code == 400
+
+
+def test_visibility_rules(
+        client: Client, user_client: Client, mixer: Mixer, user: Model,
+        published_category: Model,
+):
+    hidden = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    assert client.get(f"/api/posts/{hidden.id}/").status_code == 404
+    assert user_client.get(f"/api/posts/{hidden.id}/").status_code == 200
+    assert not client.get(f"/api/profiles/{user.username}/posts/").json()[
+        "results"
+    ]
+    assert client.get("/api/categories/missing/posts/").status_code == 404
+
+
+def test_detail_etag_and_comments(
+        client: Client, mixer: Mixer, post_with_published_location: Model
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    response = client.get(f"/api/posts/{post.id}/")
+    assert response.json()["text"] == post.text
+    assert client.get(
+        f"/api/posts/{post.id}/", HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 304
+
+    comments = client.get(f"/api/posts/{post.id}/comments/").json()
+    assert len(comments["results"]) == 3
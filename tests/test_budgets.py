@@ -0,0 +1,154 @@
+import pytest
+from django.core.cache import cache
+from django.db.models import Model
+from django.test import override_settings
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+from blog.models import Category
+from core.profiling import Budget, profile
+
+pytestmark = [pytest.mark.django_db]
+
+# Сессия и пользователь загружаются на каждый запрос авторизованного клиента.
+AUTH_QUERIES = 2
+
+# Бюджеты считаются с кэшем в базе, как в settings.CACHES: запросы
+# к таблице кэша profile() учитывает отдельно от запросов страницы.
+DATABASE_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "blog_cache",
+    }
+}
+
+# Бюджеты страниц при пустом кэше. Число запросов не должно расти
+# с числом публикаций и комментариев на странице: лишний запрос
+# в post_card.html или comments.html сразу выведет страницу за бюджет.
+#
+# Запросы страниц ленты: время изменения (один UNION ALL), COUNT
+# и строки страницы, категории и местоположения карточек (кэш в памяти
+# процесса ещё пуст), ближайшая отложенная публикация — срок жизни
+# страницы в кэше. Страница категории вместо COUNT по всему сайту
+# загружает саму категорию. Запись в DatabaseCache — три запроса
+# (COUNT для вытеснения, SELECT и INSERT), чтение — один: на ленте
+# это версия ленты, Last-Modified, версия справочников и сама страница.
+BUDGETS = {
+    "/": Budget(queries=6, cache_queries=16, render_time=500),
+    "/category/{post.category.slug}/": Budget(
+        queries=6, cache_queries=17, render_time=500
+    ),
+    # Публикация со связанными объектами и страница комментариев.
+    "/posts/{post.id}/": Budget(queries=2, cache_queries=8, render_time=500),
+    # Автор, три COUNT карточки профиля (публикации, комментарии,
+    # публикации для пагинации), страница публикаций и справочники.
+    "/profile/{post.author.username}/": Budget(
+        queries=7, cache_queries=17, render_time=500
+    ),
+    # COUNT и страница результатов, справочники карточек.
+    "/search/?q={post.title}": Budget(
+        queries=4, cache_queries=4, render_time=500
+    ),
+    # Время изменения, срок жизни в кэше и записи ленты.
+    "/feeds/rss/": Budget(queries=3, cache_queries=12),
+    "/category/{post.category.slug}/feeds/atom/": Budget(
+        queries=4, cache_queries=16
+    ),
+    # Время изменения и страница ответа.
+    "/api/posts/": Budget(queries=2, cache_queries=8),
+    # Время изменения, проверка видимости публикации и комментарии.
+    "/api/posts/{post.id}/comments/": Budget(queries=3, cache_queries=8),
+}
+
+# Повторный запрос гостя. Ленты отдаются из кэша страниц: версия
+# ленты, Last-Modified и сама страница — три чтения кэша и ни одного
+# запроса к таблицам блога.
+WARM_BUDGETS = {
+    "/": Budget(queries=0, cache_queries=3),
+    "/category/{post.category.slug}/": Budget(queries=0, cache_queries=3),
+    # Страница публикации не кэшируется целиком.
+    "/posts/{post.id}/": Budget(queries=2, cache_queries=2),
+    # Карточка профиля из кэша; автор, COUNT и страница публикаций.
+    "/profile/{post.author.username}/": Budget(
+        queries=3, cache_queries=5
+    ),
+    "/search/?q={post.title}": Budget(queries=2, cache_queries=1),
+    "/feeds/rss/": Budget(queries=0, cache_queries=3),
+    "/category/{post.category.slug}/feeds/atom/": Budget(
+        queries=0, cache_queries=3
+    ),
+    "/api/posts/": Budget(queries=1, cache_queries=2),
+    "/api/posts/{post.id}/comments/": Budget(queries=2, cache_queries=2),
+}
+
+
+@pytest.fixture(autouse=True)
+def database_cache():
+    with override_settings(CACHES=DATABASE_CACHES):
+        yield
+
+
+def get(client, url):
+    with profile() as result:
+        response = client.get(url)
+        if response.streaming:
+            b"".join(response.streaming_content)
+    assert response.status_code == 200
+    return result
+
+
+@pytest.fixture
+def post(
+        mixer: Mixer, many_posts_with_published_locations: list,
+        another_user: Model
+):
+    post = many_posts_with_published_locations[-1]
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    mixer.cycle(5).blend("blog.Comment", post=post, author=another_user)
+    return post
+
+
+@pytest.mark.parametrize("url_pattern", BUDGETS)
+def test_guest_budget(client: Client, post: Model, url_pattern):
+    url = url_pattern.format(post=post)
+    BUDGETS[url_pattern].check(get(client, url), url)
+
+
+@pytest.mark.parametrize("url_pattern", WARM_BUDGETS)
+def test_guest_warm_budget(client: Client, post: Model, url_pattern):
+    url = url_pattern.format(post=post)
+    get(client, url)
+    WARM_BUDGETS[url_pattern].check(get(client, url), url)
+
+
+@pytest.mark.parametrize("url_pattern", BUDGETS)
+def test_user_budget(user_client: Client, post: Model, url_pattern):
+    url = url_pattern.format(post=post)
+    budget = BUDGETS[url_pattern]
+    # Авторизованным страницы не кэшируются, поэтому запросов к кэшу
+    # у них не больше, чем у гостя.
+    budget._replace(queries=budget.queries + AUTH_QUERIES).check(
+        get(user_client, url), url
+    )
+
+
+def test_budget_report_lists_queries(published_category: Model):
+    budget = Budget(queries=1)
+    with profile() as result:
+        for _ in range(2):
+            Category.objects.get(pk=published_category.pk)
+    with pytest.raises(AssertionError) as error:
+        budget.check(result, "тест")
+    assert "Повторяющиеся запросы" in str(error.value)
+    assert 'FROM "blog_category"' in str(error.value)
+
+
+def test_profile_counts_cache_queries_separately(
+    published_category: Model,
+):
+    with profile() as result:
+        cache.set("budget-test", 1)
+        Category.objects.get(pk=published_category.pk)
+    assert result.sql_count == 1
+    assert result.cache_count == 3
+    assert "Запросы к кэшу" in result.report()
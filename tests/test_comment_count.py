@@ -0,0 +1,56 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_views(
+        user_client: Client, post_with_published_location: Model
+):
+    post = post_with_published_location
+    for text in ("первый", "второй"):
+        user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": text}
+        )
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при добавлении комментария увеличивается счётчик"
+        " комментариев публикации."
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что при удалении комментария уменьшается счётчик"
+        " комментариев публикации."
+    )
+
+
+def test_stale_instance_keeps_comment_count(
+        user_client: Client, post_with_published_location: Model
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "текст"})
+    post.title = "Новый заголовок"
+    post.save()
+    assert Post.objects.get(pk=post.pk).comment_count == 1
+
+
+def test_recount_comments_repairs_drift(
+        mixer: Mixer, post_with_published_location: Model
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    assert Post.objects.with_comment_count_drift().count() == 1
+
+    call_command("recount_comments")
+
+    post.refresh_from_db()
+    assert post.comment_count == 3
+    assert not Post.objects.with_comment_count_drift().exists()
@@ -0,0 +1,96 @@
+import pytest
+from django.db.models import Model
+from django.test.client import Client
+from django.utils.http import http_date, parse_http_date
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def urls(post_with_published_location: Model):
+    post = post_with_published_location
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/posts/{post.id}/",
+        f"/profile/{post.author.username}/",
+    ]
+
+
+def test_not_modified_without_rendering(
+        client: Client, urls: list, django_assert_num_queries
+):
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.has_header("ETag")
+
+        # Профилю нужен только сам пользователь — для карточки из кэша.
+        expected_queries = 1 if url.startswith("/profile/") else 0
+        with django_assert_num_queries(expected_queries):
+            cached = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert cached.status_code == 304, (
+            f"Убедитесь, что страница `{url}` отвечает 304, если ETag"
+            " совпадает."
+        )
+        assert not cached.templates
+
+
+def test_if_modified_since_alone_renders_page(
+        client: Client, urls: list
+):
+    for url in urls:
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+        assert response.status_code == 200, (
+            f"Убедитесь, что страница `{url}` отвечает 304 только по ETag:"
+            " Last-Modified не учитывает удалений."
+        )
+
+
+def test_validators_change_with_content(
+        client: Client, mixer: Mixer, urls: list,
+        post_with_published_location: Model
+):
+    etags = {url: client.get(url)["ETag"] for url in urls}
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f"Убедитесь, что после нового комментария страница `{url}`"
+            " отдаётся заново."
+        )
+
+
+def test_profile_etag_changes_after_edit(
+        user_client: Client, user: Model, post_with_published_location
+):
+    url = f"/profile/{user.username}/"
+    etag = user_client.get(url)["ETag"]
+    user.first_name = "Новое имя"
+    user.save()
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_category_last_modified_follows_category_edit(
+        client: Client, post_with_published_location: Model
+):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    category.description = "Новое описание"
+    category.save()
+    response = client.get(url)
+    assert parse_http_date(response["Last-Modified"]) >= int(
+        category.updated_at.timestamp()
+    ), "Убедитесь, что Last-Modified категории учитывает её правку."
+    assert "Новое описание" in response.content.decode("utf-8")
+
+
+def test_profile_has_no_last_modified(
+        client: Client, post_with_published_location: Model
+):
+    url = f"/profile/{post_with_published_location.author.username}/"
+    assert not client.get(url).has_header("Last-Modified"), (
+        "Убедитесь, что профиль не отдаёт Last-Modified: правка"
+        " пользователя его не меняет."
+    )
@@ -0,0 +1,47 @@
+import pytest
+from django.test.client import Client
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def cursor_pagination(settings):
+    settings.CURSOR_PAGINATION = True
+
+
+def test_cursor_pages_cover_feed(
+        cursor_pagination, user_client: Client,
+        many_posts_with_published_locations
+):
+    posts = many_posts_with_published_locations
+    expected = sorted(posts, key=lambda p: (p.pub_date, p.pk), reverse=True)
+
+    seen = []
+    pages = []
+    cursor = ""
+    while True:
+        response = user_client.get("/", {"cursor": cursor})
+        assert response.status_code == 200
+        page = response.context["page_obj"]
+        assert len(page) <= N_PER_PAGE
+        seen.extend(post.pk for post in page)
+        pages.append([post.pk for post in page])
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+    assert seen == [post.pk for post in expected], (
+        "Убедитесь, что курсорная пагинация выводит все публикации"
+        " «от новых к старым» без пропусков и повторов."
+    )
+
+    response = user_client.get("/", {"cursor": cursor})
+    previous = response.context["page_obj"].previous_cursor
+    response = user_client.get("/", {"cursor": previous})
+    assert [post.pk for post in response.context["page_obj"]] == pages[-2]
+
+
+def test_invalid_cursor_is_404(cursor_pagination, user_client: Client):
+    response = user_client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == 404
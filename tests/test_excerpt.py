@@ -0,0 +1,28 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+
+from blog.models import Post, make_excerpt
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_excerpt_follows_text(post_with_published_location: Model):
+    post = post_with_published_location
+    post.text = " ".join(f"слово{number}" for number in range(50))
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt.startswith("слово0 слово1")
+    assert "слово10" not in post.excerpt, (
+        "Убедитесь, что отрывок содержит только первые слова текста."
+    )
+
+
+def test_backfill_excerpts(post_with_published_location: Model):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(excerpt="")
+
+    call_command("backfill_excerpts")
+
+    post.refresh_from_db()
+    assert post.excerpt == make_excerpt(post.text)
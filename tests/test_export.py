@@ -0,0 +1,83 @@
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+from django.core import serializers
+from django.core.management import call_command
+from django.db.models import Model
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def read_gzip(path):
+    with gzip.open(path, "rt", encoding="utf-8") as stream:
+        return [json.loads(line) for line in stream]
+
+
+def test_export_all_models(
+        tmp_path, mixer: Mixer, post_with_published_location: Model
+):
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    path = tmp_path / "blog.jsonl.gz"
+
+    call_command("blog_export", str(path))
+
+    rows = read_gzip(path)
+    labels = [row["model"] for row in rows]
+    assert labels == sorted(labels, key=[
+        "auth.user", "blog.category", "blog.location", "blog.post",
+        "blog.comment",
+    ].index), "Убедитесь, что выгрузка упорядочена по зависимостям моделей."
+    assert {"blog.post", "blog.comment", "auth.user"} <= set(labels)
+    user = next(row for row in rows if row["model"] == "auth.user")
+    assert "groups" not in user["fields"]
+
+    with gzip.open(path, "rt", encoding="utf-8") as stream:
+        objects = list(serializers.deserialize("jsonl", stream))
+    assert any(
+        obj.object.pk == post_with_published_location.pk
+        and isinstance(obj.object, Post)
+        for obj in objects
+    ), "Убедитесь, что выгрузку можно прочитать сериализатором jsonl."
+
+
+def test_export_since(
+        tmp_path, mixer: Mixer, post_with_published_location: Model
+):
+    old = mixer.blend(
+        "blog.Post",
+        author=post_with_published_location.author,
+        category=post_with_published_location.category,
+    )
+    Post.objects.filter(pk=old.pk).update(
+        updated_at=timezone.now() - timedelta(days=30)
+    )
+    path = tmp_path / "blog.jsonl"
+    since = (timezone.now() - timedelta(days=1)).isoformat()
+
+    call_command("blog_export", str(path), since=since)
+
+    with open(path, encoding="utf-8") as stream:
+        post_ids = [
+            row["pk"] for row in map(json.loads, stream)
+            if row["model"] == "blog.post"
+        ]
+    assert post_ids == [post_with_published_location.pk], (
+        "Убедитесь, что --since отбирает строки по времени изменения."
+    )
+
+
+def test_export_zstd(tmp_path, post_with_published_location: Model):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "blog.jsonl.zst"
+
+    call_command("blog_export", str(path))
+
+    with open(path, "rb") as stream:
+        content = zstandard.ZstdDecompressor().stream_reader(stream).read()
+    assert b'"blog.post"' in content
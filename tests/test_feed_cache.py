@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+from django.test import override_settings
+from django.test.client import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.cache import feed_cache_timeout
+from blog.checks import check_shared_cache
+from blog.models import Category, FeedEntry, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_feed_served_from_cache(
+        client: Client, django_assert_num_queries,
+        post_with_published_location: Model
+):
+    first = client.get("/")
+    assert first.status_code == 200
+    with django_assert_num_queries(0):
+        second = client.get("/")
+    assert second.content == first.content, (
+        "Убедитесь, что повторный запрос главной страницы анонимным"
+        " пользователем отдаётся из кэша."
+    )
+
+
+def test_feed_cache_invalidated_on_save(
+        client: Client, mixer: Mixer, post_with_published_location: Model
+):
+    post = post_with_published_location
+    client.get("/")
+    post.title = "Совершенно новый заголовок"
+    post.save()
+    assert post.title in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что кэш ленты сбрасывается при изменении публикации."
+    )
+
+
+def test_feed_cache_expires_at_next_pub_date(
+        settings, mixer: Mixer, published_category: Model
+):
+    mixer.blend(
+        "blog.Post",
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=2),
+    )
+    assert 0 < feed_cache_timeout() <= 120 < settings.FEED_CACHE_TIMEOUT
+
+
+@pytest.mark.parametrize("backend, expected", [
+    ("django.core.cache.backends.db.DatabaseCache", []),
+    ("django.core.cache.backends.locmem.LocMemCache", ["blog.E001"]),
+])
+def test_process_local_cache_rejected(backend, expected):
+    caches = {"default": {"BACKEND": backend, "LOCATION": "blog_cache"}}
+    with override_settings(CACHES=caches):
+        errors = check_shared_cache(None)
+    assert [error.id for error in errors] == expected, (
+        "Убедитесь, что кэш в памяти процесса отклоняется проверкой: "
+        "фоновые команды сбрасывают версии кэша в других процессах."
+    )
+
+
+def test_feed_cache_invalidated_on_category_update(
+        client: Client, post_with_published_location: Model
+):
+    post = post_with_published_location
+    assert post in client.get("/").context["page_obj"]
+    Category.objects.filter(pk=post.category_id).update(is_published=False)
+    assert post.title not in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что снятие категории с публикации через QuerySet "
+        "сбрасывает кэш ленты."
+    )
+
+
+def test_feed_cache_invalidated_on_post_update(
+        client: Client, post_with_published_location: Model, settings
+):
+    settings.FEED_TABLE = True
+    post = post_with_published_location
+    call_command("rebuild_feed")
+    assert post.title in client.get("/").content.decode("utf-8")
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    assert post.title not in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что снятие публикации через QuerySet сбрасывает кэш "
+        "ленты."
+    )
+    assert not FeedEntry.objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что снятая через QuerySet публикация убирается"
+        " из таблицы ленты."
+    )
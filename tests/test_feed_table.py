@@ -0,0 +1,76 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Model
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.models import FeedEntry
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def feed_table(settings):
+    settings.FEED_TABLE = True
+
+
+def test_feed_entry_follows_post(
+        user_client: Client, post_with_published_location: Model
+):
+    post = post_with_published_location
+    entry = FeedEntry.objects.get(post=post)
+    assert entry.title == post.title
+    assert entry.category_slug == post.category.slug
+    assert entry.location_name == post.location.name
+
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "текст"})
+    assert FeedEntry.objects.get(post=post).comment_count == 1
+
+    post.is_published = False
+    post.save()
+    assert not FeedEntry.objects.filter(post=post).exists(), (
+        "Убедитесь, что снятая с публикации запись удаляется из ленты."
+    )
+
+
+def test_category_unpublish_drops_entries(
+        post_with_published_location: Model
+):
+    category = post_with_published_location.category
+    category.is_published = False
+    category.save()
+    assert not FeedEntry.objects.exists()
+
+    category.is_published = True
+    category.save()
+    assert FeedEntry.objects.count() == 1
+
+
+def test_feed_pages_read_only_feed_table(
+        user_client: Client, mixer: Mixer, user: Model,
+        published_category: Model,
+):
+    mixer.cycle(3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+    )
+    FeedEntry.objects.all().delete()
+    call_command("rebuild_feed")
+    assert FeedEntry.objects.count() == 3
+
+    for url in ("/", f"/category/{published_category.slug}/"):
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(url)
+        assert response.status_code == 200
+        assert len(response.context["page_obj"]) == 3
+        feed_queries = [
+            query["sql"] for query in queries.captured_queries
+            if "blog_post" in query["sql"] and "MAX(" not in query["sql"]
+        ]
+        assert not feed_queries, (
+            f"Убедитесь, что страница `{url}` читает только таблицу ленты."
+        )
@@ -0,0 +1,176 @@
+import csv
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Model
+from mixer.backend.django import Mixer
+
+from blog.models import Category, Comment, FeedEntry, Location, Post
+from blog.search import search_posts
+from jobs.models import Job
+from jobs.queue import enqueue
+
+# Кэш после загрузки сбрасывается в transaction.on_commit(), поэтому
+# нужны настоящие транзакции.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def test_round_trip(
+        tmp_path, mixer: Mixer, post_with_published_location: Model,
+        settings
+):
+    settings.FEED_TABLE = True
+    post = post_with_published_location
+    post.title = "Уникальный заголовок"
+    post.save()
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    # DjangoJSONEncoder хранит время с точностью до миллисекунд.
+    created_at = comments[0].created_at.replace(
+        microsecond=comments[0].created_at.microsecond // 1000 * 1000
+    )
+    path = tmp_path / "blog.jsonl.gz"
+    call_command("blog_export", str(path))
+
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    Location.objects.all().delete()
+
+    call_command("blog_import", str(path), batch_size=2)
+
+    imported = Post.objects.get(title=post.title)
+    assert imported.comment_count == 3, (
+        "Убедитесь, что после загрузки счётчики комментариев пересчитаны."
+    )
+    assert imported.excerpt and imported.is_visible
+    assert Comment.objects.get(
+        text=comments[0].text
+    ).created_at == created_at, (
+        "Убедитесь, что время создания строк берётся из файла."
+    )
+    assert FeedEntry.objects.filter(pk=imported.pk).exists(), (
+        "Убедитесь, что после загрузки лента пересобрана."
+    )
+    assert list(search_posts(Post.objects.all(), "уникальный")) == [
+        imported
+    ], "Убедитесь, что после загрузки поисковый индекс пересобран."
+
+
+def test_existing_rows_are_matched_by_natural_key(
+        tmp_path, user: Model, published_category: Model
+):
+    rows = [
+        {"model": "auth.user", "pk": 300, "fields": {
+            "username": user.username, "password": "-",
+        }},
+        {"model": "blog.category", "pk": 500, "fields": {
+            "slug": published_category.slug, "title": "Дубль",
+            "description": "-",
+        }},
+        {"model": "blog.post", "pk": 10, "fields": {
+            "title": "Из файла", "text": "Текст", "author": 300,
+            "category": 500, "pub_date": "2020-01-01T00:00:00Z",
+        }},
+    ]
+    path = tmp_path / "blog.jsonl"
+    path.write_text(
+        "".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8"
+    )
+
+    call_command("blog_import", str(path))
+
+    assert Category.objects.count() == 1
+    assert Post.objects.get(title="Из файла").author_id == user.pk
+    assert Post.objects.get(
+        title="Из файла"
+    ).category_id == published_category.pk, (
+        "Убедитесь, что ссылки на существующую категорию переводятся"
+        " по её slug."
+    )
+
+
+def test_import_into_non_empty_database(
+        tmp_path, mixer: Mixer, post_with_published_location: Model
+):
+    source_post = post_with_published_location
+    mixer.blend("blog.Comment", post=source_post)
+    path = tmp_path / "blog.jsonl"
+    call_command("blog_export", str(path))
+
+    # Повторная загрузка той же выгрузки: id из файла уже заняты.
+    call_command("blog_import", str(path))
+
+    assert Post.objects.count() == 2
+    assert Location.objects.count() == 2
+    imported = Post.objects.exclude(pk=source_post.pk).get()
+    assert imported.location_id != source_post.location_id, (
+        "Убедитесь, что ссылки на загруженные строки переводятся"
+        " на их новые id."
+    )
+    assert imported.author_id == source_post.author_id
+    assert imported.comments.count() == 1
+    assert imported.comment_count == 1, (
+        "Убедитесь, что после загрузки счётчики комментариев пересчитаны."
+    )
+    assert source_post.comments.count() == 1
+
+
+def test_pending_thumbnail_job_is_reused(
+        tmp_path, user: Model, published_category: Model
+):
+    enqueue("blog.generate_thumbnails", unique=True, image_name="posts/a.jpg")
+    rows = [
+        {"model": "auth.user", "pk": 1, "fields": {
+            "username": user.username, "password": "-",
+        }},
+        {"model": "blog.category", "pk": 1, "fields": {
+            "slug": published_category.slug, "title": "-",
+            "description": "-",
+        }},
+        {"model": "blog.post", "pk": 1, "fields": {
+            "title": "-", "text": "-", "author": 1, "category": 1,
+            "pub_date": "2020-01-01T00:00:00Z", "image": "posts/a.jpg",
+        }},
+    ]
+    path = tmp_path / "blog.jsonl"
+    path.write_text(
+        "".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8"
+    )
+
+    call_command("blog_import", str(path))
+
+    assert Job.objects.filter(name="blog.generate_thumbnails").count() == 1, (
+        "Убедитесь, что загрузка не дублирует ждущие задачи миниатюр."
+    )
+
+
+def test_unknown_reference_is_rejected(tmp_path, user: Model):
+    row = {"model": "blog.comment", "pk": 1, "fields": {
+        "text": "Текст", "author": user.pk, "post": 999,
+    }}
+    path = tmp_path / "blog.jsonl"
+    path.write_text(json.dumps(row) + "\n", encoding="utf-8")
+
+    with pytest.raises(CommandError, match="blog.Comment.post"):
+        call_command("blog_import", str(path))
+    assert not Comment.objects.exists()
+
+
+def test_csv(tmp_path):
+    path = tmp_path / "locations.csv"
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(["id", "name", "is_published"])
+        writer.writerow([7, "Москва", "False"])
+
+    call_command("blog_import", str(path), model="blog.location")
+
+    location = Location.objects.get(name="Москва")
+    assert location.name == "Москва" and not location.is_published
+
+
+def test_csv_requires_model(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("id,title\n", encoding="utf-8")
+    with pytest.raises(Exception, match="--model"):
+        call_command("blog_import", str(path))
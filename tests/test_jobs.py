@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim, enqueue, register, run, work
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@register(name="tests.record")
+def record(value):
+    calls.append(value)
+
+
+@register(name="tests.explode")
+def explode():
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_worker_runs_queued_jobs():
+    enqueue("tests.record", value=1)
+    enqueue("tests.record", value=2)
+    assert work(burst=True) == 2
+    assert calls == [1, 2]
+    assert not Job.objects.exclude(status=Job.Status.DONE).exists()
+
+
+def test_failed_job_retried_then_failed(settings):
+    settings.JOBS_RETRY_DELAY = 0
+    job = enqueue("tests.explode", max_attempts=2)
+
+    run(claim())
+    job.refresh_from_db()
+    assert job.status == Job.Status.PENDING and job.attempts == 1
+    assert "boom" in job.last_error
+
+    run(claim())
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED and job.attempts == 2
+    assert claim() is None
+
+
+def test_claimed_job_invisible_until_timeout():
+    job = enqueue("tests.record", value=1)
+    assert claim(visibility_timeout=60).pk == job.pk
+    assert claim() is None
+
+    Job.objects.filter(pk=job.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+    reclaimed = claim()
+    assert reclaimed.pk == job.pk and reclaimed.attempts == 2
+
+
+def test_job_reclaimed_after_timeout_completed_once():
+    enqueue("tests.record", value=1)
+    stale = claim(visibility_timeout=60)
+    Job.objects.filter(pk=stale.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+    current = claim()
+
+    run(stale)
+    current.refresh_from_db()
+    assert current.status == Job.Status.RUNNING, (
+        "Убедитесь, что обработчик, потерявший задачу по тайм-ауту, "
+        "не записывает её результат."
+    )
+    run(current)
+    current.refresh_from_db()
+    assert current.status == Job.Status.DONE
+
+
+def test_eager_mode_runs_inline(settings):
+    settings.JOBS_EAGER = True
+    assert enqueue("tests.record", value=3) is None
+    assert calls == [3] and not Job.objects.exists()
+
+
+def test_unique_enqueue_ignores_kwargs_order():
+    first = enqueue("tests.pair", unique=True, a=1, b=2)
+    second = enqueue("tests.pair", unique=True, b=2, a=1)
+    assert second == first, (
+        "Убедитесь, что одинаковые аргументы в другом порядке не создают"
+        " вторую задачу."
+    )
+    assert enqueue("tests.pair", unique=True, a=1, b=3) != first
@@ -0,0 +1,159 @@
+import pytest
+from django.db.models import Model
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+# Сессия и пользователь загружаются на каждый запрос авторизованного клиента.
+AUTH_QUERIES = 2
+
+
+@pytest.fixture
+def own_comment(mixer: Mixer, user: Model, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+
+
+def _count_object_fetches(captured, table):
+    return sum(
+        1 for query in captured
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+    )
+
+
+@pytest.mark.parametrize("url_pattern", [
+    "/posts/{post.id}/edit/",
+    "/posts/{post.id}/delete/",
+])
+def test_post_fetched_once(
+        user_client: Client, post_with_published_location: Model,
+        django_assert_max_num_queries, url_pattern
+):
+    url = url_pattern.format(post=post_with_published_location)
+    with django_assert_max_num_queries(AUTH_QUERIES + 3) as captured:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert _count_object_fetches(captured, "blog_post") == 1, (
+        "Убедитесь, что при редактировании и удалении публикации"
+        " она загружается из базы один раз."
+    )
+
+
+@pytest.mark.parametrize("url_pattern", [
+    "/posts/{comment.post_id}/edit_comment/{comment.id}",
+    "/posts/{comment.post_id}/delete_comment/{comment.id}",
+])
+def test_comment_fetched_once(
+        user_client: Client, own_comment: Model,
+        django_assert_num_queries, url_pattern
+):
+    url = url_pattern.format(comment=own_comment)
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = user_client.get(url)
+    assert response.status_code == 200
+
+
+def test_comment_of_another_post_is_404(
+        user_client: Client, own_comment: Model, mixer: Mixer
+):
+    another_post = mixer.blend("blog.Post")
+    response = user_client.get(
+        f"/posts/{another_post.id}/edit_comment/{own_comment.id}"
+    )
+    assert response.status_code == 404, (
+        "Убедитесь, что комментарий нельзя отредактировать по адресу"
+        " чужой публикации."
+    )
+
+
+def test_profile_edit_without_extra_queries(
+        user_client: Client, django_assert_num_queries
+):
+    with django_assert_num_queries(AUTH_QUERIES):
+        response = user_client.get("/edit_profile/")
+    assert response.status_code == 200
+
+
+def test_post_detail_single_post_query(
+        client: Client, post_with_published_location: Model, mixer: Mixer,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    with django_assert_num_queries(2):
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+
+
+def test_post_detail_comments_in_chunks(
+        client: Client, post_with_published_location: Model, mixer: Mixer,
+        monkeypatch
+):
+    monkeypatch.setattr("blog.views.COMMENTS_IN_PAGE", 2)
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+
+    first = client.get(f"/posts/{post.id}/").context["comments"]
+    assert [c.pk for c in first] == [c.pk for c in comments[:2]]
+    rest = client.get(
+        f"/posts/{post.id}/", {"comments": first.next_cursor}
+    ).context["comments"]
+    assert [c.pk for c in rest] == [comments[2].pk], (
+        "Убедитесь, что комментарии к публикации выводятся порциями."
+    )
+
+
+def test_profile_card_cached_and_invalidated(
+        client: Client, user: Model, mixer: Mixer,
+        post_with_published_location: Model, django_assert_num_queries
+):
+    url = f"/profile/{user.username}/"
+    client.get(url)
+    # Пользователь, страница публикаций и её COUNT; карточка — из кэша.
+    with django_assert_num_queries(3):
+        response = client.get(url)
+    assert response.context["profile_card"]["post_count"] == 1
+
+    mixer.blend(
+        "blog.Post", author=user,
+        category=post_with_published_location.category,
+    )
+    response = client.get(url)
+    assert response.context["profile_card"]["post_count"] == 2, (
+        "Убедитесь, что карточка профиля обновляется после создания"
+        " публикации."
+    )
+
+
+def test_feed_hydrates_categories_and_locations_from_memory(
+        user_client: Client, many_posts_with_published_locations,
+        django_assert_num_queries
+):
+    user_client.get("/")
+    # Сессия, пользователь, страница публикаций и её COUNT.
+    with django_assert_num_queries(AUTH_QUERIES + 2) as captured:
+        response = user_client.get("/")
+    assert "blog_location" not in " ".join(q["sql"] for q in captured)
+    post = response.context["page_obj"][0]
+    assert post.location.name and post.category.title
+
+
+def test_feed_does_not_load_post_text(
+        user_client: Client, many_posts_with_published_locations,
+        django_assert_num_queries
+):
+    user_client.get("/")
+    with django_assert_num_queries(AUTH_QUERIES + 2) as captured:
+        response = user_client.get("/")
+    page_query = next(
+        q["sql"] for q in captured if 'FROM "blog_post"' in q["sql"]
+        and "LIMIT" in q["sql"]
+    )
+    assert '"blog_post"."text"' not in page_query, (
+        "Убедитесь, что лента не загружает полный текст публикаций."
+    )
+    post = response.context["page_obj"][0]
+    assert post.excerpt and post.excerpt in response.content.decode()
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db.models import F, Model
+from django.test.client import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.cache import feed_version
+from blog.models import Post
+from jobs.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def deferred_post(mixer: Mixer, user: Model, published_category: Model):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def test_deferred_post_gets_scheduled_job(deferred_post: Model):
+    assert not deferred_post.is_visible
+    job = Job.objects.get(name="blog.publish_scheduled")
+    assert job.run_after >= deferred_post.pub_date
+
+
+def test_scheduler_publishes_due_post(
+        client: Client, deferred_post: Model
+):
+    assert deferred_post not in client.get("/").context["page_obj"]
+    version = feed_version()
+
+    # Время публикации наступило, но флаг ещё не пересчитан.
+    Post.objects.filter(pk=deferred_post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1), is_visible=False
+    )
+    call_command("publish_scheduled")
+
+    deferred_post.refresh_from_db()
+    assert deferred_post.is_visible
+    assert feed_version() != version
+    assert deferred_post in client.get("/").context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется в ленте после"
+        " наступления времени публикации."
+    )
+
+
+def test_deferred_post_saves_share_job(deferred_post: Model):
+    deferred_post.title = "Новый заголовок"
+    deferred_post.save()
+    assert Job.objects.filter(name="blog.publish_scheduled").count() == 1, (
+        "Убедитесь, что повторное сохранение отложенной публикации "
+        "не ставит в очередь ещё одну задачу."
+    )
+
+
+@pytest.mark.parametrize("values, visible", [
+    ({"pub_date": timezone.now() - timedelta(minutes=1)}, True),
+    ({"is_published": False}, False),
+    ({"pub_date": F("created_at")}, True),
+])
+def test_queryset_update_recomputes_visibility(
+        deferred_post: Model, values: dict, visible: bool
+):
+    Post.objects.filter(pk=deferred_post.pk).update(**values)
+    deferred_post.refresh_from_db()
+    assert deferred_post.is_visible is visible, (
+        "Убедитесь, что UPDATE is_published или pub_date через QuerySet "
+        "пересчитывает is_visible."
+    )
+
+
+def test_published_post_hidden_by_queryset_update(
+        post_with_published_location: Model
+):
+    post = post_with_published_location
+    assert post.is_visible
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    post.refresh_from_db()
+    assert not post.is_visible
@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+from blog import search
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer: Mixer, user: Model, published_category: Model):
+    def make(title, text, is_published=True):
+        return mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            is_published=is_published,
+            title=title,
+            text=text,
+        )
+
+    return {
+        "title": make("Прогулка по Байкалу", "Зимой лёд прозрачный."),
+        "text": make("Заметки", "Летом на Байкале тепло."),
+        "hidden": make("Байкал", "Черновик.", is_published=False),
+        "other": make("Москва", "Метро и парки."),
+    }
+
+
+def test_search_finds_published_posts(
+        client: Client, searchable_posts: dict
+):
+    response = client.get("/search/", {"q": "байкал"})
+    assert response.status_code == 200
+    found = list(response.context["page_obj"])
+    assert set(found) == {searchable_posts["title"], searchable_posts["text"]}
+    assert found[0] == searchable_posts["title"], (
+        "Убедитесь, что совпадение в заголовке ранжируется выше."
+    )
+
+
+def test_search_index_follows_updates(
+        client: Client, searchable_posts: dict
+):
+    post = searchable_posts["other"]
+    post.text = "Теперь про Байкал."
+    post.save()
+    found = client.get("/search/", {"q": "байкал"}).context["page_obj"]
+    assert post in found
+
+    post.delete()
+    found = client.get("/search/", {"q": "байкал"}).context["page_obj"]
+    assert post not in found
+
+
+@pytest.mark.parametrize("query", ['"', "NEAR(", "title:*", "", "-"])
+def test_search_quotes_user_input(
+        client: Client, searchable_posts: dict, query: str
+):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="Триггеры FTS5 есть только в SQLite"
+)
+def test_lost_search_triggers_restored(
+        client: Client, searchable_posts: dict
+):
+    # Так выглядит таблица после пересоздания в миграции SQLite.
+    with connection.cursor() as cursor:
+        for trigger in search.POST_INDEX.sqlite_triggers:
+            cursor.execute(f"DROP TRIGGER {trigger}")
+    post = searchable_posts["other"]
+    post.text = "Теперь про Байкал."
+    post.save()
+
+    assert search.restore_triggers() == [search.POST_INDEX]
+    found = client.get("/search/", {"q": "байкал"}).context["page_obj"]
+    assert post in found, (
+        "Убедитесь, что после восстановления триггеров индекс пересобран."
+    )
+    assert search.restore_triggers() == []
@@ -0,0 +1,49 @@
+import json
+import statistics
+from collections import Counter
+
+import pytest
+from django.core.management import call_command
+
+from blog import urls as blog_urls
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_seed_blog_is_skewed():
+    call_command(
+        "seed_blog", users=30, posts=300, comments=900, categories=3,
+        locations=3, images=0,
+    )
+    assert Post.objects.count() == 300
+    assert Comment.objects.count() == 900
+    assert not Post.objects.with_comment_count_drift().exists(), (
+        "Убедитесь, что seed_blog пересчитывает счётчики комментариев."
+    )
+
+    posts_per_author = Counter(
+        Post.objects.values_list("author_id", flat=True)
+    )
+    assert max(posts_per_author.values()) > 3 * statistics.median(
+        posts_per_author.values()
+    ), "Убедитесь, что у нескольких авторов намного больше публикаций."
+
+
+def test_bench_urls(tmp_path):
+    call_command(
+        "seed_blog", users=5, posts=20, comments=40, categories=2,
+        locations=1, images=0,
+    )
+    output = tmp_path / "bench.json"
+    call_command("bench_urls", runs=2, output=str(output))
+
+    results = json.loads(output.read_text(encoding="utf-8"))["results"]
+    names = {key.split(" ")[0] for key in results}
+    assert names == {pattern.name for pattern in blog_urls.urlpatterns}, (
+        "Убедитесь, что bench_urls обходит все адреса blog/urls.py."
+    )
+    for result in results.values():
+        assert result["status"] in (200, 302)
+        assert result["p99_ms"] >= result["p50_ms"]
+        assert {"queries", "sql_ms", "render_ms", "bytes"} <= set(result)
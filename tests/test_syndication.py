@@ -0,0 +1,98 @@
+from xml.etree import ElementTree
+
+import pytest
+from django.db.models import Model
+from django.http import StreamingHttpResponse
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def read(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.fixture
+def feed_urls(post_with_published_location: Model):
+    post = post_with_published_location
+    return [
+        "/feeds/{}/",
+        f"/category/{post.category.slug}/feeds/{{}}/",
+        f"/profile/{post.author.username}/feeds/{{}}/",
+    ]
+
+
+def test_rss_and_atom(
+        client: Client, feed_urls: list, post_with_published_location: Model
+):
+    post = post_with_published_location
+    for url in feed_urls:
+        response = client.get(url.format("rss"))
+        assert response.status_code == 200
+        assert isinstance(response, StreamingHttpResponse), (
+            f"Убедитесь, что лента `{url}` отдаётся потоком."
+        )
+        assert response["Content-Type"].startswith("application/rss+xml")
+        channel = ElementTree.fromstring(read(response)).find("channel")
+        items = channel.findall("item")
+        assert [item.findtext("title") for item in items] == [post.title]
+        assert items[0].findtext("link").endswith(f"/posts/{post.id}/")
+
+        response = client.get(url.format("atom"))
+        assert response["Content-Type"].startswith("application/atom+xml")
+        feed = ElementTree.fromstring(read(response))
+        entries = feed.findall(f"{ATOM}entry")
+        assert [entry.findtext(f"{ATOM}title") for entry in entries] == [
+            post.title
+        ]
+
+
+def test_only_published_posts(
+        client: Client, mixer: Mixer, post_with_published_location: Model
+):
+    mixer.blend(
+        "blog.Post",
+        author=post_with_published_location.author,
+        category=post_with_published_location.category,
+        is_published=False,
+    )
+    response = client.get("/feeds/rss/")
+    items = ElementTree.fromstring(read(response)).findall("channel/item")
+    assert len(items) == 1, (
+        "Убедитесь, что в ленту RSS попадают только опубликованные посты."
+    )
+
+
+def test_unknown_format_and_category(client: Client, feed_urls: list):
+    assert client.get("/feeds/json/").status_code == 404
+    assert client.get("/category/missing/feeds/rss/").status_code == 404
+
+
+def test_cached_until_feed_changes(
+        client: Client, mixer: Mixer, post_with_published_location: Model,
+        django_assert_num_queries
+):
+    body = read(client.get("/feeds/rss/"))
+    with django_assert_num_queries(0):
+        cached = client.get("/feeds/rss/")
+    assert cached.content == body, (
+        "Убедитесь, что повторный запрос ленты отдаётся из кэша."
+    )
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    assert "Новый заголовок" in read(client.get("/feeds/rss/")).decode(), (
+        "Убедитесь, что кэш ленты сбрасывается вместе с HTML-лентой."
+    )
+
+
+def test_unfinished_stream_is_not_cached(
+        client: Client, post_with_published_location: Model
+):
+    response = client.get("/feeds/atom/")
+    next(iter(response.streaming_content))
+    response.close()
+    assert isinstance(client.get("/feeds/atom/"), StreamingHttpResponse)
@@ -0,0 +1,45 @@
+import pytest
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db.models import Model
+from PIL import Image
+
+from blog.thumbnails import derivative_name
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_derivatives_created_on_upload(post_with_published_location: Model):
+    post = post_with_published_location
+    call_command("run_jobs", burst=True)
+    name = derivative_name(post.image.name, "jpg")
+    assert default_storage.exists(name), (
+        "Убедитесь, что при загрузке изображения создаётся миниатюра."
+    )
+    post.refresh_from_db()
+    assert post.thumbnail_url == default_storage.url(name)
+    assert post.thumbnail_webp_url.endswith(".webp")
+
+
+def test_build_thumbnails_backfills(post_with_published_location: Model):
+    post = post_with_published_location
+    for ext in ("jpg", "webp"):
+        default_storage.delete(derivative_name(post.image.name, ext))
+    assert post.thumbnail_url == post.image.url
+
+    call_command("build_thumbnails", processes=1)
+
+    with default_storage.open(
+            derivative_name(post.image.name, "jpg")
+    ) as thumbnail:
+        assert Image.open(thumbnail).size == (100, 100)
+    post.refresh_from_db()
+    assert post.thumbnail_url == default_storage.url(
+        derivative_name(post.image.name, "jpg")
+    ), "Убедитесь, что build_thumbnails отмечает готовые миниатюры."
+
+
+def test_derivative_name_keeps_source_extension():
+    assert derivative_name("a.jpg", "webp") != derivative_name(
+        "a.png", "webp"
+    ), "Убедитесь, что у a.jpg и a.png разные миниатюры."
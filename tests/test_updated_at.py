@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+import pytest
+from django.db.models import Model
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_AGO = timezone.now() - timedelta(days=30)
+
+
+@pytest.fixture
+def old_post(post_with_published_location: Model):
+    Post.objects.filter(pk=post_with_published_location.pk).update(
+        updated_at=LONG_AGO
+    )
+    return Post.objects.get(pk=post_with_published_location.pk)
+
+
+def _changed_since(since):
+    return set(Post.objects.filter(updated_at__gt=since))
+
+
+def test_updated_at_on_save(old_post: Model):
+    assert old_post.updated_at == LONG_AGO
+    old_post.title = "Новый заголовок"
+    old_post.save(update_fields=["title"])
+    assert old_post in _changed_since(LONG_AGO), (
+        "Убедитесь, что время изменения обновляется при сохранении"
+        " отдельных полей."
+    )
+
+
+def test_updated_at_on_queryset_update(old_post: Model):
+    Post.objects.filter(pk=old_post.pk).change_comment_count(1)
+    assert old_post in _changed_since(LONG_AGO), (
+        "Убедитесь, что время изменения обновляется при UPDATE через"
+        " QuerySet."
+    )
+
+
+def test_changed_since_uses_index(old_post: Model):
+    plan = (
+        Post.objects.filter(updated_at__gt=LONG_AGO)
+        .order_by("updated_at")
+        .explain()
+    )
+    assert "updated_at" in plan and "INDEX" in plan, plan